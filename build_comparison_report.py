@@ -322,6 +322,13 @@ def main() -> int:
         print(f"CSV not found: {CSV_PATH}", file=sys.stderr)
         return 1
     df = pd.read_csv(CSV_PATH)
+    # Downcast the wide score/diff columns and repeated short strings so the
+    # frame doesn't hold everything as float64/object while we iterate it.
+    score_cols = [c for c in df.columns if c.endswith("_score") or c.endswith("_diff")]
+    df[score_cols] = df[score_cols].astype("float32")
+    for c in ("sketch_type", "artist_name"):
+        if c in df.columns:
+            df[c] = df[c].astype("category")
     by_url = load_stored_by_url()
     generated_at = datetime.now().strftime("%Y-%m-%d %H:%M")
 
@@ -10,11 +10,16 @@ Configuration options allow for adjusting the AI model and prompt used for evalu
 import os
 import csv
 import time
-import json
-import pandas as pd
+import hashlib
+
+import orjson
+import asyncio
+import functools
+import httpx
 from decimal import Decimal
 from dotenv import load_dotenv
-from openai import OpenAI
+from aiolimiter import AsyncLimiter
+from openai import OpenAI, AsyncOpenAI
 import boto3
 from boto3.dynamodb.conditions import Key
 from datetime import datetime
@@ -23,6 +28,8 @@ import cloudinary.uploader
 import cloudinary.api
 from io import BytesIO
 
+from utils.evaluation import build_system_prompt, build_system_prompt_blocks, build_schema
+
 DYNAMODB_TABLE = "ruggles_artworks_prod"
 DYNAMODB_GSI = "by_created_at"
 ENTITY_TYPE = "artwork"
@@ -31,8 +38,9 @@ ENTITY_TYPE = "artwork"
 load_dotenv()
 
 # Custom implementation of Cloudinary functions without Streamlit dependencies
+@functools.lru_cache(maxsize=1)
 def init_cloudinary():
-    """Initialize Cloudinary without using Streamlit cache"""
+    """Initialize Cloudinary without using Streamlit cache (configured once per process)"""
     cloud_name = os.getenv('CLOUDINARY_CLOUD_NAME')
     api_key = os.getenv('CLOUDINARY_API_KEY')
     api_secret = os.getenv('CLOUDINARY_API_SECRET')
@@ -47,20 +55,26 @@ def init_cloudinary():
         api_secret=api_secret
     )
 
+@functools.lru_cache(maxsize=4096)
+def _build_image_url(public_id):
+    """Build (and memoize) the plain Cloudinary URL for a public_id."""
+    return cloudinary.CloudinaryImage(public_id).build_url()
+
 def get_image_url(public_id, transformation=None):
     """Get the URL for an image, optionally with transformations"""
     init_cloudinary()
-    
+
     try:
         if transformation:
+            # Transformation dicts aren't hashable; only the plain lookup is memoized
             return cloudinary.CloudinaryImage(public_id).build_url(**transformation)
-        return cloudinary.CloudinaryImage(public_id).build_url()
+        return _build_image_url(public_id)
     except Exception as e:
         print(f"Error getting image URL: {str(e)}")
         return None
 
 # Custom implementation of database functions to avoid Streamlit dependencies
-_EVAL_GROUPS = [
+_EVAL_GROUPS = (
     ("proportion_and_structure", "proportion"),
     ("line_quality", "line_quality"),
     ("value_and_light", "value_light"),
@@ -69,11 +83,12 @@ _EVAL_GROUPS = [
     ("form_and_volume", "form_volume"),
     ("mood_and_expression", "mood_expression"),
     ("overall_realism", "overall_realism"),
-]
+)
 
 
+@functools.lru_cache(maxsize=1)
 def init_dynamodb():
-    """Initialize DynamoDB Table resource (no Streamlit dependency)."""
+    """Initialize DynamoDB Table resource (no Streamlit dependency, one client per process)."""
     region = os.getenv("AWS_REGION", "us-east-1")
     access_key = os.getenv("AWS_ACCESS_KEY_ID")
     secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
@@ -115,39 +130,105 @@ def _structure_evaluation(item: dict) -> dict:
     return item
 
 
-def get_all_artworks():
-    """Return a list of all artworks, newest first, with nested evaluation_data."""
+# Only the attributes the evaluator actually reads; notably excludes the large
+# gpt_response blob, which would otherwise dominate bytes on the wire.
+_ARTWORK_COLUMNS = [
+    "id", "title", "artist_name", "created_at", "image_url", "image_public_id", "sketch_type",
+] + [f"{flat}_{suffix}" for _, flat in _EVAL_GROUPS for suffix in ("score", "rationale", "tips")]
+
+
+def iter_artworks(limit=0, page_size=100):
+    """Yield artworks one at a time, newest first, with nested evaluation_data.
+
+    Pages through the DynamoDB query lazily so downstream work can start after
+    the first page instead of waiting for the full table.
+
+    Args:
+        limit (int): Maximum number of artworks to yield (0 = no limit)
+        page_size (int): DynamoDB query page size
+    """
     table = init_dynamodb()
     if not table:
-        return []
+        return
+    # Alias every projected attribute to sidestep DynamoDB reserved words
+    names = {f"#c{i}": col for i, col in enumerate(_ARTWORK_COLUMNS)}
+    kwargs = {
+        "IndexName": DYNAMODB_GSI,
+        "KeyConditionExpression": Key("entity_type").eq(ENTITY_TYPE),
+        "ScanIndexForward": False,
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+        "Limit": min(page_size, limit) if limit > 0 else page_size,
+    }
+    yielded = 0
+    while True:
+        resp = table.query(**kwargs)
+        for item in resp.get("Items", []):
+            yield _structure_evaluation(_to_native(item))
+            yielded += 1
+            if limit > 0 and yielded >= limit:
+                return
+        if "LastEvaluatedKey" not in resp:
+            return
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+
+def get_all_artworks(limit=0):
+    """Return a list of artworks, newest first, with nested evaluation_data."""
     try:
-        items = []
-        kwargs = {
-            "IndexName": DYNAMODB_GSI,
-            "KeyConditionExpression": Key("entity_type").eq(ENTITY_TYPE),
-            "ScanIndexForward": False,
-        }
-        while True:
-            resp = table.query(**kwargs)
-            items.extend(resp.get("Items", []))
-            if "LastEvaluatedKey" not in resp:
-                break
-            kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
-        return [_structure_evaluation(_to_native(i)) for i in items]
+        return list(iter_artworks(limit=limit))
     except Exception as e:
         print(f"Error querying data: {str(e)}")
         return []
 
+@functools.lru_cache(maxsize=None)
+def _column_order(criteria_fields):
+    """Return the fixed CSV column order for a criteria tuple (memoized)."""
+    fieldnames = [
+        # Metadata
+        "id", "title", "artist_name", "created_at", "sketch_type", "generated_title", "image_url",
+
+        # Average scores
+        "existing_average_raw_score", "new_average_raw_score", "average_score_diff",
+        "existing_average_curved_score", "new_average_curved_score", "average_curved_score_diff",
+    ]
+
+    # Add criteria columns in groups (existing, new, diff) for easier comparison
+    for criteria in criteria_fields:
+        fieldnames.extend([
+            f"existing_{criteria}_score", f"new_{criteria}_score", f"{criteria}_score_diff",
+            f"new_{criteria}_rationale", f"new_{criteria}_tips",
+        ])
+    return fieldnames
+
+
+@functools.lru_cache(maxsize=None)
+def _prompt_fingerprint(sketch_type):
+    """Digest of the rendered prompt and schema for one sketch type (memoized).
+
+    Mixed into the on-disk cache key so any edit to the shared prompt or
+    schema in utils/evaluation.py invalidates cached evaluations instead of
+    silently serving scores produced by the old prompt.
+    """
+    payload = build_system_prompt(sketch_type).encode() + orjson.dumps(build_schema(sketch_type))
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
 class ArtworkEvaluator:
-    def __init__(self, model_name="gpt-4.1-2025-04-14", csv_output_path=None, sketch_type="full realism", limit=5):
+    def __init__(self, model_name="gpt-4.1-2025-04-14", csv_output_path=None, sketch_type="full realism", limit=5,
+                 concurrency=10, rpm=500, cache_dir=".ruggles_eval_cache", output_format="csv"):
         """
         Initialize the evaluator with configurable model and output path.
-        
+
         Args:
             model_name (str): The OpenAI model to use for image evaluation
             csv_output_path (str): File path for the CSV output (if None, a default path will be generated)
             sketch_type (str): Type of evaluation ("quick sketch" or "full realism")
             limit (int): Maximum number of artworks to evaluate (default: 5)
+            concurrency (int): Maximum number of in-flight OpenAI requests (default: 10)
+            rpm (int): Requests-per-minute ceiling for the OpenAI API tier (default: 500)
+            cache_dir (str): Directory for the on-disk evaluation cache (None disables caching)
+            output_format (str): "csv", "parquet", or "both" (default: "csv")
         """
         self.model_name = model_name
         
@@ -168,21 +249,35 @@ class ArtworkEvaluator:
             else:
                 self.csv_output_path = csv_output_path
                 
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.output_format = output_format
         self.evaluation_prompt = self._get_default_prompt()
         self.sketch_type = sketch_type
         self.limit = limit
-        
-        # Initialize OpenAI client
+        self.concurrency = concurrency
+        # Token-bucket limiter: only delays requests when we're actually pushing
+        # up against the RPM ceiling, rather than taxing every artwork equally.
+        self._rate_limiter = AsyncLimiter(max_rate=rpm, time_period=60)
+
+        # On-disk memo of parsed evaluations, keyed by (image URL, sketch type,
+        # model, prompt/schema fingerprint). Re-runs skip the API entirely for
+        # artworks already scored with the current prompt.
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        # Initialize OpenAI clients (sync for one-off calls, async for the evaluation fan-out)
         openai_api_key = os.getenv("OPENAI_API_KEY")
         if not openai_api_key:
             raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in your .env file.")
-        self.client = OpenAI(api_key=openai_api_key)
+        # Explicit keep-alive pooling so concurrent requests reuse warm TLS connections.
+        # max_retries uses the SDK's built-in exponential backoff (with Retry-After
+        # handling) so transient 429/5xx errors don't permanently drop an artwork.
+        limits = httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60)
+        self.client = OpenAI(api_key=openai_api_key, max_retries=5, http_client=httpx.Client(limits=limits))
+        self.aclient = AsyncOpenAI(api_key=openai_api_key, max_retries=5, http_client=httpx.AsyncClient(limits=limits))
         
-        # Initialize Cloudinary
-        init_cloudinary()
-
-        # Initialize DynamoDB (validates credentials up front)
+        # Initialize DynamoDB (validates credentials up front; Cloudinary is
+        # configured lazily on first get_image_url call)
         if init_dynamodb() is None:
             raise ValueError("Failed to initialize DynamoDB client. Check AWS credentials.")
     
@@ -224,10 +319,14 @@ Overall Realism – How realistic is the overall sketch in terms of visual belie
             self.sketch_type = sketch_type
             print(f"Sketch type updated to: {sketch_type}")
     
+    def iter_images(self):
+        """Yield artworks from the database one at a time (capped by self.limit)."""
+        return iter_artworks(limit=self.limit)
+
     def get_all_images(self):
-        """Retrieve all artworks from the database."""
-        print("Retrieving all artworks from the database...")
-        artworks = get_all_artworks()
+        """Retrieve artworks from the database (capped server-side by self.limit)."""
+        print("Retrieving artworks from the database...")
+        artworks = get_all_artworks(limit=self.limit)
 
         if not artworks:
             print("No artworks found in the database.")
@@ -236,516 +335,529 @@ Overall Realism – How realistic is the overall sketch in terms of visual belie
         print(f"Retrieved {len(artworks)} artworks.")
         return artworks
     
-    def evaluate_image(self, artwork):
+    def _resolve_image_url(self, artwork):
+        """Return the image URL for an artwork, falling back to its Cloudinary public_id."""
+        image_url = artwork.get('image_url')
+        if not image_url:
+            public_id = artwork.get('image_public_id')
+            if public_id:
+                # Cap the delivered size: the Vision API downsamples internally,
+                # so a full-resolution original only adds transfer time
+                image_url = get_image_url(public_id, transformation={"width": 2048, "crop": "limit", "quality": "auto"})
+
+        if not image_url:
+            print(f"Error: No image URL found for artwork ID {artwork.get('id', 'Unknown')}")
+            return None
+        return image_url
+
+    def _cache_path(self, image_url):
+        """Return the cache file path for one (image URL, sketch type, model, prompt) key."""
+        # The hash is only a cache key, not a security primitive; blake2b is the
+        # fastest stable digest in the stdlib and keeps filenames short.
+        key = hashlib.blake2b(
+            f"{image_url}|{self.sketch_type}|{self.model_name}|{_prompt_fingerprint(self.sketch_type)}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _cache_get(self, image_url):
+        """Return a previously cached evaluation, or None on a miss."""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(image_url), "rb") as f:
+                return orjson.loads(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _cache_put(self, image_url, evaluation_data):
+        """Persist a parsed evaluation to the on-disk cache."""
+        if not self.cache_dir:
+            return
+        path = self._cache_path(image_url)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(evaluation_data))
+            # Atomic rename so a crash mid-write can't leave a torn cache entry
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Failed to write evaluation cache entry: {str(e)}")
+
+    async def evaluate_image(self, artwork):
         """
         Evaluate a single image using the configured AI model and prompt.
-        
+
         Args:
             artwork (dict): Artwork data from the database
-        
+
         Returns:
             dict: Evaluation results
         """
-        image_url = artwork.get('image_url')
+        image_url = self._resolve_image_url(artwork)
         if not image_url:
-            public_id = artwork.get('image_public_id')
-            if public_id:
-                image_url = get_image_url(public_id)
-            
-        if not image_url:
-            print(f"Error: No image URL found for artwork ID {artwork.get('id', 'Unknown')}")
             return None
-        
-        print(f"Evaluating image: {artwork.get('title', 'Untitled')} (ID: {artwork.get('id', 'Unknown')})")
-        
-        # Prepare the system prompt based on sketch type
-        system_prompt = "You are an expert art critic and instructor. Evaluate the provided sketch using the following criteria, scoring each one on a scale of 1 to 20 (1 = Poor, 20 = Excellent). For each category, include:"
-        system_prompt += """
-A 1–3 sentence rationale explaining the score.
-A set of 1–3 actionable tips for how the artist could improve the submitted artwork specifically in each area.
 
-Also, please create a creative title for this artwork based on what you see.
-If you recognize a character, object, or location, please include that in the title.
+        # File I/O runs in a worker thread so cache hits/writes never stall the
+        # event loop while other requests are in flight
+        cached = await asyncio.to_thread(self._cache_get, image_url)
+        if cached is not None:
+            print(f"Using cached evaluation: {artwork.get('title', 'Untitled')} (ID: {artwork.get('id', 'Unknown')})")
+            return cached
 
-Evaluation Criteria:
-Proportion & Structure – Are the relative sizes and shapes of elements accurate and well-constructed?
-Line Quality – Are the lines confident, controlled, and varied to define form, contour, or texture effectively?"""
+        print(f"Evaluating image: {artwork.get('title', 'Untitled')} (ID: {artwork.get('id', 'Unknown')})")
 
-        # Add additional criteria for full realism mode
-        if self.sketch_type == "full realism":
-            system_prompt += """
-Value & Light – Is there effective use of shading and light to create realistic depth, contrast, and form?
-Detail & Texture – Are the textures believable and appropriate for the subject? Is the level of detail well-judged?
-Composition & Perspective – Is the placement of elements balanced? Is perspective applied accurately?"""
-            
-        # Add form and volume, mood and expression for both modes
-        system_prompt += """
-Form & Volume – Does the drawing feel three-dimensional? Are forms convincingly modeled through shading or structure?
-Mood & Expression – Does the image evoke a mood, emotion, or atmosphere, even subtly?"""
-            
-        # Add overall realism for full realism mode only
-        if self.sketch_type == "full realism":
-            system_prompt += """
-Overall Realism – How realistic is the overall sketch in terms of visual believability and execution?"""
-
-        # Create JSON schema based on sketch type
-        schema = {
-            "type": "object",
-            "properties": {
-                "generated_title": {
-                    "type": "string",
-                    "description": "A creative title for the artwork"
-                },
-                "proportion_and_structure": {
-                    "type": "object",
-                    "properties": {
-                        "score": {
-                            "type": "integer",
-                            "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                        },
-                        "rationale": {
-                            "type": "string",
-                            "description": "1-3 sentence explanation for the score"
-                        },
-                        "improvement_tips": {
-                            "type": "array",
-                            "items": {
-                                "type": "string"
-                            },
-                            "description": "1-3 actionable tips for improvement"
-                        }
-                    },
-                    "required": ["score", "rationale", "improvement_tips"],
-                    "additionalProperties": False
-                },
-                "line_quality": {
-                    "type": "object",
-                    "properties": {
-                        "score": {
-                            "type": "integer",
-                            "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                        },
-                        "rationale": {
-                            "type": "string",
-                            "description": "1-3 sentence explanation for the score"
-                        },
-                        "improvement_tips": {
-                            "type": "array",
-                            "items": {
-                                "type": "string"
-                            },
-                            "description": "1-3 actionable tips for improvement"
-                        }
-                    },
-                    "required": ["score", "rationale", "improvement_tips"],
-                    "additionalProperties": False
-                },
-                "form_and_volume": {
-                    "type": "object",
-                    "properties": {
-                        "score": {
-                            "type": "integer",
-                            "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                        },
-                        "rationale": {
-                            "type": "string",
-                            "description": "1-3 sentence explanation for the score"
-                        },
-                        "improvement_tips": {
-                            "type": "array",
-                            "items": {
-                                "type": "string"
-                            },
-                            "description": "1-3 actionable tips for improvement"
-                        }
-                    },
-                    "required": ["score", "rationale", "improvement_tips"],
-                    "additionalProperties": False
-                },
-                "mood_and_expression": {
-                    "type": "object",
-                    "properties": {
-                        "score": {
-                            "type": "integer",
-                            "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                        },
-                        "rationale": {
-                            "type": "string",
-                            "description": "1-3 sentence explanation for the score"
-                        },
-                        "improvement_tips": {
-                            "type": "array",
-                            "items": {
-                                "type": "string"
-                            },
-                            "description": "1-3 actionable tips for improvement"
-                        }
-                    },
-                    "required": ["score", "rationale", "improvement_tips"],
-                    "additionalProperties": False
-                }
-            },
-            "required": ["generated_title", "proportion_and_structure", "line_quality", "form_and_volume", "mood_and_expression"],
-            "additionalProperties": False
-        }
-        
-        # Add additional schema properties for full realism mode
-        if self.sketch_type == "full realism":
-            schema["properties"]["value_and_light"] = {
-                "type": "object",
-                "properties": {
-                    "score": {
-                        "type": "integer",
-                        "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                    },
-                    "rationale": {
-                        "type": "string",
-                        "description": "1-3 sentence explanation for the score"
-                    },
-                    "improvement_tips": {
-                        "type": "array",
-                        "items": {
-                            "type": "string"
-                        },
-                        "description": "1-3 actionable tips for improvement"
-                    }
-                },
-                "required": ["score", "rationale", "improvement_tips"],
-                "additionalProperties": False
-            }
-            
-            schema["properties"]["detail_and_texture"] = {
-                "type": "object",
-                "properties": {
-                    "score": {
-                        "type": "integer",
-                        "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                    },
-                    "rationale": {
-                        "type": "string",
-                        "description": "1-3 sentence explanation for the score"
-                    },
-                    "improvement_tips": {
-                        "type": "array",
-                        "items": {
-                            "type": "string"
-                        },
-                        "description": "1-3 actionable tips for improvement"
-                    }
-                },
-                "required": ["score", "rationale", "improvement_tips"],
-                "additionalProperties": False
-            }
-            
-            schema["properties"]["composition_and_perspective"] = {
-                "type": "object",
-                "properties": {
-                    "score": {
-                        "type": "integer",
-                        "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                    },
-                    "rationale": {
-                        "type": "string",
-                        "description": "1-3 sentence explanation for the score"
-                    },
-                    "improvement_tips": {
-                        "type": "array",
-                        "items": {
-                            "type": "string"
-                        },
-                        "description": "1-3 actionable tips for improvement"
-                    }
-                },
-                "required": ["score", "rationale", "improvement_tips"],
-                "additionalProperties": False
-            }
-            
-            schema["properties"]["overall_realism"] = {
-                "type": "object",
-                "properties": {
-                    "score": {
-                        "type": "integer",
-                        "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                    },
-                    "rationale": {
-                        "type": "string",
-                        "description": "1-3 sentence explanation for the score"
-                    },
-                    "improvement_tips": {
-                        "type": "array",
-                        "items": {
-                            "type": "string"
-                        },
-                        "description": "1-3 actionable tips for improvement"
-                    }
-                },
-                "required": ["score", "rationale", "improvement_tips"],
-                "additionalProperties": False
-            }
-            
-            # Update required properties for full realism
-            schema["required"] = ["generated_title", "proportion_and_structure", "line_quality", "value_and_light", 
-                                "detail_and_texture", "composition_and_perspective", 
-                                "form_and_volume", "mood_and_expression", "overall_realism"]
-        
         try:
             # Use OpenAI's vision capabilities to evaluate the image with structured response
-            response = self.client.responses.create(
-                model=self.model_name,
-                input=[
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "input_text",
-                                "text": f"Here's an artwork by {artwork.get('artist_name', 'Unknown artist')}."
-                            },
-                            {
-                                "type": "input_image",
-                                "image_url": image_url
-                            }
-                        ]
-                    }
-                ],
-                text={
-                    "format": {
-                        "type": "json_schema",
-                        "name": "artwork_evaluation",
-                        "schema": schema,
-                        "strict": True
-                    }
-                }
-            )
-            
+            async with self._rate_limiter:
+                response = await self.aclient.responses.create(**self._build_request(artwork, image_url))
+
             try:
-                # Parse JSON response
-                evaluation_data = json.loads(response.output_text)
+                # Parse JSON response (orjson is ~2-3x faster on nested dicts this shape)
+                evaluation_data = orjson.loads(response.output_text)
+                await asyncio.to_thread(self._cache_put, image_url, evaluation_data)
                 return evaluation_data
-            except (json.JSONDecodeError, AttributeError) as e:
+            except (orjson.JSONDecodeError, ValueError, AttributeError) as e:
                 print(f"Error: Failed to parse JSON response for artwork ID {artwork.get('id', 'Unknown')}: {str(e)}")
                 return None
-                
+
         except Exception as e:
             print(f"Error evaluating image (ID: {artwork.get('id', 'Unknown')}): {str(e)}")
             return None
+
+    def _build_request(self, artwork, image_url):
+        """
+        Build the Responses API request kwargs for one artwork.
+
+        Shared by the real-time path (evaluate_image) and the Batch API path
+        (evaluate_all_images_batch), so both send the identical payload.
+        """
+        schema = build_schema(self.sketch_type)
+
+        return {
+            "model": self.model_name,
+            "input": [
+                {
+                    # Static preamble first, mode suffix second, so the shared
+                    # prefix stays eligible for OpenAI's prompt caching
+                    "role": "system",
+                    "content": [
+                        {"type": "input_text", "text": text}
+                        for text in build_system_prompt_blocks(self.sketch_type)
+                    ]
+                },
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "input_text",
+                            "text": f"Here's an artwork by {artwork.get('artist_name', 'Unknown artist')}."
+                        },
+                        {
+                            "type": "input_image",
+                            "image_url": image_url
+                        }
+                    ]
+                }
+            ],
+            "text": {
+                "format": {
+                    "type": "json_schema",
+                    "name": "artwork_evaluation",
+                    "schema": schema,
+                    "strict": True
+                }
+            }
+        }
     
+    @staticmethod
+    def _result_for(artwork, new_evaluation):
+        """Combine basic artwork metadata with a freshly produced evaluation."""
+        return {
+            "id": artwork.get("id"),
+            "title": artwork.get("title", "Untitled"),
+            "artist_name": artwork.get("artist_name", "Unknown"),
+            "created_at": artwork.get("created_at", ""),
+            "image_url": artwork.get("image_url", ""),
+            "sketch_type": artwork.get("sketch_type", "full realism"),
+            "evaluation_data": artwork.get("evaluation_data", {}),
+            "new_evaluation": new_evaluation,
+        }
+
+    # Durability/batching trade-off for the streamed CSV output
+    _FLUSH_EVERY_ROWS = 20
+
+    async def _evaluate_all_async(self, artwork_iter, writer, fp):
+        """Producer/consumer pipeline: one producer pulls artworks from the lazy
+        DB iterator while self.concurrency consumers evaluate and write rows."""
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        rows_written = 0
+
+        async def produce():
+            it = iter(artwork_iter)
+            count = 0
+            while True:
+                # The blocking DynamoDB pagination runs in a worker thread
+                try:
+                    artwork = await asyncio.to_thread(next, it, None)
+                except Exception as e:
+                    # Match get_all_artworks: a query error mid-pagination ends
+                    # the run gracefully with whatever was already queued
+                    # instead of escaping asyncio.run as a raw traceback
+                    print(f"Error querying data: {str(e)}")
+                    break
+                if artwork is None:
+                    break
+                count += 1
+                await queue.put((count, artwork))
+            print(f"Queued {count} artworks for evaluation")
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        fieldnames = self._csv_fieldnames()
+
+        async def consume():
+            nonlocal rows_written
+            while True:
+                entry = await queue.get()
+                if entry is None:
+                    return
+                i, artwork = entry
+                print(f"Processing artwork {i}...")
+                try:
+                    new_evaluation = await self.evaluate_image(artwork)
+                except Exception as e:
+                    print(f"Error evaluating image (ID: {artwork.get('id', 'Unknown')}): {str(e)}")
+                    continue
+                if not new_evaluation:
+                    continue
+                flat_result = self._flatten_result(self._result_for(artwork, new_evaluation))
+                writer.writerow([flat_result.get(col, "") for col in fieldnames])
+                rows_written += 1
+                # Flush in batches: a per-row flush would drain the 1 MiB
+                # buffer on every write and coalesce nothing. Every N rows
+                # bounds what a crash can lose to a handful of evaluations
+                # while still batching the syscalls; close() flushes the rest.
+                if rows_written % self._FLUSH_EVERY_ROWS == 0:
+                    fp.flush()
+
+        await asyncio.gather(produce(), *[consume() for _ in range(self.concurrency)])
+        return rows_written
+
     def evaluate_all_images(self):
         """
-        Evaluate all images and return the results, limited by self.limit.
-        
+        Evaluate all images (limited by self.limit), streaming each row to the CSV
+        output as its evaluation completes. Evaluation of the first page begins
+        while later pages are still being fetched.
+
+        Returns:
+            int: Number of rows written to the CSV
+        """
+        if self.limit > 0:
+            print(f"Evaluating up to {self.limit} artworks")
+        else:
+            print("Evaluating all artworks")
+
+        fp, output_path = self._open_output_file()
+        with fp:
+            # Plain csv.writer with a fixed-order projection is the fastest
+            # stdlib path; the projection also drops any unexpected keys.
+            writer = csv.writer(fp)
+            writer.writerow(self._csv_fieldnames())
+            rows_written = asyncio.run(self._evaluate_all_async(self.iter_images(), writer, fp))
+
+        self._last_output_path = output_path
+        print(f"Results saved to {output_path} ({rows_written} rows)")
+        return rows_written
+
+    @staticmethod
+    def _batch_output_text(response_body):
+        """Extract the output_text equivalent from a Batch API response body."""
+        for output_item in response_body.get("output", []):
+            if output_item.get("type") != "message":
+                continue
+            for content_item in output_item.get("content", []):
+                if content_item.get("type") == "output_text":
+                    return content_item.get("text", "")
+        return ""
+
+    def evaluate_all_images_batch(self, poll_interval=30, max_poll_interval=300):
+        """
+        Evaluate all images through the OpenAI Batch API (50% cheaper, 24h window).
+
+        Builds one JSONL request line per artwork, uploads it, creates a batch
+        against /v1/responses, polls until completion, then joins the output back
+        to the artworks by custom_id.
+
         Returns:
-            list: List of evaluation results that include both new evaluations and existing data
+            list: Same result shape as evaluate_all_images().
         """
         artworks = self.get_all_images()
-        results = []
-        
-        # Limit the number of artworks to evaluate
+
         if self.limit > 0 and len(artworks) > self.limit:
             print(f"Limiting evaluations to {self.limit} artworks (out of {len(artworks)} total)")
             artworks = artworks[:self.limit]
-        else:
-            print(f"Evaluating all {len(artworks)} artworks")
-        
-        for i, artwork in enumerate(artworks):
-            print(f"Processing artwork {i+1} of {len(artworks)}...")
-            
-            # Basic artwork metadata
-            artwork_data = {
+
+        artworks_by_id = {}
+        jsonl_buffer = BytesIO()
+        request_count = 0
+        for artwork in artworks:
+            image_url = self._resolve_image_url(artwork)
+            if not image_url:
+                continue
+            custom_id = str(artwork.get("id"))
+            artworks_by_id[custom_id] = artwork
+            # orjson.dumps yields bytes directly, skipping a separate UTF-8 encode pass
+            jsonl_buffer.write(orjson.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/responses",
+                "body": self._build_request(artwork, image_url),
+            }))
+            jsonl_buffer.write(b"\n")
+            request_count += 1
+
+        if not request_count:
+            print("No artworks with images to evaluate.")
+            return []
+
+        print(f"Submitting batch of {request_count} evaluation requests...")
+        jsonl_buffer.seek(0)
+        input_file = self.client.files.create(
+            file=("artwork_evaluations.jsonl", jsonl_buffer),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/responses",
+            completion_window="24h",
+        )
+        print(f"Batch {batch.id} created. Polling for completion...")
+
+        # Poll with exponential backoff until the batch reaches a terminal state
+        wait = poll_interval
+        while True:
+            batch = self.client.batches.retrieve(batch.id)
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                print(f"Batch {batch.id} ended with status '{batch.status}'.")
+                return []
+            print(f"Batch status: {batch.status}. Checking again in {wait}s...")
+            time.sleep(wait)
+            wait = min(wait * 2, max_poll_interval)
+
+        output_content = self.client.files.content(batch.output_file_id)
+        results = []
+        for line in output_content.text.splitlines():
+            if not line.strip():
+                continue
+            output_line = orjson.loads(line)
+            artwork = artworks_by_id.get(output_line.get("custom_id"))
+            if artwork is None:
+                continue
+
+            response_body = (output_line.get("response") or {}).get("body") or {}
+            try:
+                new_evaluation = orjson.loads(self._batch_output_text(response_body))
+            except (orjson.JSONDecodeError, ValueError) as e:
+                print(f"Error: Failed to parse JSON response for artwork ID {artwork.get('id', 'Unknown')}: {str(e)}")
+                continue
+
+            results.append({
                 "id": artwork.get("id"),
                 "title": artwork.get("title", "Untitled"),
                 "artist_name": artwork.get("artist_name", "Unknown"),
                 "created_at": artwork.get("created_at", ""),
                 "image_url": artwork.get("image_url", ""),
                 "sketch_type": artwork.get("sketch_type", "full realism"),
-                "evaluation_data": artwork.get("evaluation_data", {})
-            }
-            
-            # Evaluate the image
-            new_evaluation = self.evaluate_image(artwork)
-            
-            if new_evaluation:
-                # Combine artwork metadata with evaluation
-                result = {
-                    **artwork_data,
-                    "new_evaluation": new_evaluation
-                }
-                results.append(result)
-            
-            # Sleep briefly to avoid API rate limits
-            time.sleep(1)
-        
+                "evaluation_data": artwork.get("evaluation_data", {}),
+                "new_evaluation": new_evaluation,
+            })
+
+        print(f"Batch complete: {len(results)} evaluations retrieved.")
         return results
-    
-    def save_to_csv(self, results):
-        """
-        Save evaluation results to a CSV file, including existing scores from the database.
-        If the original file path is inaccessible, will try to save to a uniquely named file.
-        
-        Args:
-            results (list): List of evaluation results
+
+    # All criteria that can appear in a CSV row (quick sketch rows leave the last four empty)
+    _CSV_CRITERIA = (
+        "proportion_and_structure", "line_quality", "form_and_volume", "mood_and_expression",
+        "value_and_light", "detail_and_texture", "composition_and_perspective", "overall_realism",
+    )
+
+    def _csv_fieldnames(self):
+        """Return the fixed CSV column order (metadata, averages, then per-criteria groups)."""
+        return _column_order(self._CSV_CRITERIA)
+
+    @staticmethod
+    def _curve(raw_avg_score):
+        """Map a raw average (1-20) onto the curved 0-10 scale.
+
+        Branchless equivalent of the old "18+ becomes 10, else subtract 8,
+        floor at 0" ladder: scores of 18-20 clamp to 10 via the min().
         """
-        if not results:
-            print("No results to save.")
-            return
-        
-        # Convert nested JSON structure to flat format for CSV
-        flattened_results = []
-        
-        for result in results:
-            # Start with basic metadata
-            flat_result = {
-                "id": result.get("id"),
-                "title": result.get("title"),
-                "artist_name": result.get("artist_name"),
-                "created_at": result.get("created_at"),
-                "image_url": result.get("image_url"),
-                "sketch_type": result.get("sketch_type", self.sketch_type)
-            }
-            
-            # Get the new evaluation data
-            new_evaluation = result.get("new_evaluation", {})
-            flat_result["generated_title"] = new_evaluation.get("generated_title", "")
-            
-            # Get existing evaluation data
-            existing_evaluation = result.get("evaluation_data", {})
-            
-            # Criteria fields to process
-            criteria_fields = ["proportion_and_structure", "line_quality", "form_and_volume", "mood_and_expression"]
-            
-            # Add full realism criteria if applicable
-            if self.sketch_type == "full realism" or flat_result["sketch_type"] == "full realism":
-                criteria_fields.extend(["value_and_light", "detail_and_texture", "composition_and_perspective", "overall_realism"])
-            
-            # Calculate average scores for both existing and new evaluations
-            existing_scores = []
-            new_scores = []
-            
-            # Process each criteria
-            for criteria in criteria_fields:
-                # Process new evaluation data
-                if criteria in new_evaluation:
-                    # New scores
-                    new_score = new_evaluation[criteria].get("score")
-                    flat_result[f"new_{criteria}_score"] = new_score
-                    flat_result[f"new_{criteria}_rationale"] = new_evaluation[criteria].get("rationale", "")
-                    
-                    # Join improvement tips into a single string
-                    tips = new_evaluation[criteria].get("improvement_tips", [])
-                    flat_result[f"new_{criteria}_tips"] = "; ".join(tips) if tips else ""
-                    
-                    if new_score:
-                        new_scores.append(new_score)
-                
-                # Process existing evaluation data
-                if criteria in existing_evaluation:
-                    # Existing scores
-                    existing_score = existing_evaluation[criteria].get("score")
-                    flat_result[f"existing_{criteria}_score"] = existing_score
-                    
-                    if existing_score:
-                        existing_scores.append(existing_score)
-                    
-                    # Calculate difference between new and existing scores if both exist
-                    if new_score and existing_score:
-                        flat_result[f"{criteria}_score_diff"] = new_score - existing_score
-            
-            # Calculate average scores
-            if existing_scores:
-                existing_avg_score = sum(existing_scores) / len(existing_scores)
-                flat_result["existing_average_raw_score"] = existing_avg_score
-                
-                # Calculate curved score for existing average
-                if existing_avg_score >= 18:
-                    existing_curved_score = 10
-                else:
-                    existing_curved_score = max(0, existing_avg_score - 8)
-                flat_result["existing_average_curved_score"] = existing_curved_score
-            
-            if new_scores:
-                new_avg_score = sum(new_scores) / len(new_scores)
-                flat_result["new_average_raw_score"] = new_avg_score
-                
-                # Calculate curved score for new average
-                if new_avg_score >= 18:
-                    new_curved_score = 10
-                else:
-                    new_curved_score = max(0, new_avg_score - 8)
-                flat_result["new_average_curved_score"] = new_curved_score
-                
-                # Calculate difference in average scores if both exist
-                if existing_scores:
-                    flat_result["average_score_diff"] = new_avg_score - existing_avg_score
-                    flat_result["average_curved_score_diff"] = new_curved_score - existing_curved_score
-            
-            flattened_results.append(flat_result)
-        
-        # Convert to DataFrame and save to CSV
-        df = pd.DataFrame(flattened_results)
-        
-        # Reorder columns for better readability
-        column_order = [
-            # Metadata
-            "id", "title", "artist_name", "created_at", "sketch_type", "generated_title", "image_url",
-            
-            # Average scores
-            "existing_average_raw_score", "new_average_raw_score", "average_score_diff",
-            "existing_average_curved_score", "new_average_curved_score", "average_curved_score_diff"
-        ]
-        
-        # Add criteria columns in pairs (existing, new, diff) for easier comparison
+        return min(10, max(0, raw_avg_score - 8))
+
+    def _flatten_result(self, result):
+        """Flatten one nested evaluation result into a single CSV row dict."""
+        # Start with basic metadata
+        flat_result = {
+            "id": result.get("id"),
+            "title": result.get("title"),
+            "artist_name": result.get("artist_name"),
+            "created_at": result.get("created_at"),
+            "image_url": result.get("image_url"),
+            "sketch_type": result.get("sketch_type", self.sketch_type)
+        }
+
+        # Get the new evaluation data
+        new_evaluation = result.get("new_evaluation", {})
+        flat_result["generated_title"] = new_evaluation.get("generated_title", "")
+
+        # Get existing evaluation data
+        existing_evaluation = result.get("evaluation_data", {})
+
+        # Criteria fields to process
+        criteria_fields = ["proportion_and_structure", "line_quality", "form_and_volume", "mood_and_expression"]
+
+        # Add full realism criteria if applicable
+        if self.sketch_type == "full realism" or flat_result["sketch_type"] == "full realism":
+            criteria_fields.extend(["value_and_light", "detail_and_texture", "composition_and_perspective", "overall_realism"])
+
+        # Flatten each criteria's fields into columns
         for criteria in criteria_fields:
-            column_order.extend([
-                f"existing_{criteria}_score", f"new_{criteria}_score", f"{criteria}_score_diff",
-                f"new_{criteria}_rationale", f"new_{criteria}_tips"
-            ])
-        
-        # Ensure all columns exist before reordering
-        available_columns = [col for col in column_order if col in df.columns]
-        remaining_columns = [col for col in df.columns if col not in column_order]
-        ordered_columns = available_columns + remaining_columns
-        
-        # Reorder dataframe
-        df = df[ordered_columns]
-        
-        # Try to save to the original filename first
+            new_data = new_evaluation.get(criteria)
+            if new_data is not None:
+                flat_result[f"new_{criteria}_score"] = new_data.get("score")
+                flat_result[f"new_{criteria}_rationale"] = new_data.get("rationale", "")
+
+                # Join improvement tips into a single string
+                tips = new_data.get("improvement_tips", [])
+                flat_result[f"new_{criteria}_tips"] = "; ".join(tips) if tips else ""
+
+            existing_data = existing_evaluation.get(criteria)
+            if existing_data is not None:
+                flat_result[f"existing_{criteria}_score"] = existing_data.get("score")
+
+        # Aggregate scores and diffs in single passes over the column groups
+        new_scores = [s for c in criteria_fields if (s := flat_result.get(f"new_{c}_score"))]
+        existing_scores = [s for c in criteria_fields if (s := flat_result.get(f"existing_{c}_score"))]
+        for criteria in criteria_fields:
+            new_score = flat_result.get(f"new_{criteria}_score")
+            existing_score = flat_result.get(f"existing_{criteria}_score")
+            if new_score and existing_score:
+                flat_result[f"{criteria}_score_diff"] = new_score - existing_score
+
+        # Calculate average scores
+        if existing_scores:
+            existing_avg_score = sum(existing_scores) / len(existing_scores)
+            existing_curved_score = self._curve(existing_avg_score)
+            flat_result["existing_average_raw_score"] = existing_avg_score
+            flat_result["existing_average_curved_score"] = existing_curved_score
+
+        if new_scores:
+            new_avg_score = sum(new_scores) / len(new_scores)
+            new_curved_score = self._curve(new_avg_score)
+            flat_result["new_average_raw_score"] = new_avg_score
+            flat_result["new_average_curved_score"] = new_curved_score
+
+            # Calculate difference in average scores if both exist
+            if existing_scores:
+                flat_result["average_score_diff"] = new_avg_score - existing_avg_score
+                flat_result["average_curved_score_diff"] = new_curved_score - existing_curved_score
+
+        return flat_result
+
+    def _open_output_file(self):
+        """
+        Open the CSV output path for writing, falling back to a uniquely named file
+        (and finally the home directory) if the original path is inaccessible.
+
+        Returns:
+            tuple: (open file object, path actually opened)
+        """
         try:
-            df.to_csv(self.csv_output_path, index=False)
-            print(f"Results saved to {self.csv_output_path}")
-            
+            # 1 MiB buffer so per-row streamed writes batch into few syscalls
+            return open(self.csv_output_path, "w", newline="", encoding="utf-8", buffering=1 << 20), self.csv_output_path
         except PermissionError:
             # If permission error (file might be open in another program), create a unique filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             file_base, file_ext = os.path.splitext(self.csv_output_path)
             new_filename = f"{file_base}_{timestamp}{file_ext}"
-            
+
             try:
-                df.to_csv(new_filename, index=False)
-                print(f"Original file was inaccessible. Results saved to {new_filename} instead.")
+                fp = open(new_filename, "w", newline="", encoding="utf-8", buffering=1 << 20)
+                print(f"Original file was inaccessible. Saving results to {new_filename} instead.")
+                return fp, new_filename
             except Exception as e:
-                print(f"Error saving CSV: {str(e)}")
-                
+                print(f"Error opening CSV: {str(e)}")
+
                 # Last resort: save to user's home directory
                 home_dir = os.path.expanduser("~")
                 last_resort_file = os.path.join(home_dir, f"ruggles_evaluation_{timestamp}.csv")
-                
-                try:
-                    df.to_csv(last_resort_file, index=False)
-                    print(f"Results saved to {last_resort_file}")
-                except Exception as e2:
-                    print(f"Failed to save results: {str(e2)}")
-        
+                return open(last_resort_file, "w", newline="", encoding="utf-8", buffering=1 << 20), last_resort_file
+
+    def save_to_csv(self, results):
+        """
+        Save a list of evaluation results to the CSV output.
+
+        The real-time path streams rows directly as evaluations complete; this is
+        kept for callers that already hold a full result list (e.g. batch mode).
+
+        Args:
+            results (list): List of evaluation results
+        """
+        if not results:
+            print("No results to save.")
+            return
+
+        fieldnames = self._csv_fieldnames()
+        fp, output_path = self._open_output_file()
+        with fp:
+            writer = csv.writer(fp)
+            writer.writerow(fieldnames)
+            for result in results:
+                flat_result = self._flatten_result(result)
+                writer.writerow([flat_result.get(col, "") for col in fieldnames])
+
+        self._last_output_path = output_path
+        print(f"Results saved to {output_path}")
+
+    def _write_parquet(self):
+        """Convert the streamed CSV output into a Parquet file alongside it.
+
+        Parquet is written from the finished CSV (rather than buffered in
+        memory) so the streaming, crash-safe CSV path stays the source of
+        truth; pandas/pyarrow are only imported when actually requested.
+        """
+        csv_path = getattr(self, "_last_output_path", self.csv_output_path)
+        try:
+            import pandas as pd
+        except ImportError:
+            print("Warning: pandas and pyarrow are required for Parquet output; keeping CSV only.")
+            return
+
+        parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+        try:
+            pd.read_csv(csv_path).to_parquet(parquet_path, engine="pyarrow", compression="zstd")
         except Exception as e:
-            print(f"Error saving CSV: {str(e)}")
-    
-    def run_evaluation(self):
+            print(f"Warning: Failed to write Parquet output: {str(e)}")
+            return
+        print(f"Parquet copy saved to {parquet_path}")
+
+        if self.output_format == "parquet":
+            os.remove(csv_path)
+
+    def run_evaluation(self, use_batch=False):
         """Run the full evaluation process and save results."""
         print(f"Starting evaluation using model: {self.model_name}")
-        results = self.evaluate_all_images()
-        self.save_to_csv(results)
+        if use_batch:
+            results = self.evaluate_all_images_batch()
+            self.save_to_csv(results)
+        else:
+            # Streams rows to the CSV itself; returns the number of rows written
+            results = self.evaluate_all_images()
+        if self.output_format in ("parquet", "both"):
+            self._write_parquet()
         print("Evaluation complete!")
         return results
 
@@ -760,8 +872,18 @@ if __name__ == "__main__":
     parser.add_argument("--prompt-file", help="Path to a text file containing a custom evaluation prompt")
     parser.add_argument("--sketch-type", default="full realism", choices=["quick sketch", "full realism"], 
                        help="Type of evaluation to perform")
-    parser.add_argument("--limit", type=int, default=5, 
+    parser.add_argument("--limit", type=int, default=5,
                        help="Maximum number of artworks to evaluate (default: 5, use 0 for no limit)")
+    parser.add_argument("--concurrency", type=int, default=10,
+                       help="Maximum number of in-flight OpenAI requests (default: 10)")
+    parser.add_argument("--rpm", type=int, default=500,
+                       help="Requests-per-minute ceiling for your OpenAI tier (default: 500)")
+    parser.add_argument("--format", default="csv", choices=["csv", "parquet", "both"],
+                       help="Output format: csv (default), parquet, or both")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Skip the on-disk evaluation cache and re-query the model for every artwork")
+    parser.add_argument("--batch", action="store_true",
+                       help="Submit evaluations through the OpenAI Batch API (50%% cheaper, up to 24h turnaround)")
     
     args = parser.parse_args()
     
@@ -770,7 +892,11 @@ if __name__ == "__main__":
         model_name=args.model, 
         csv_output_path=args.output, 
         sketch_type=args.sketch_type,
-        limit=args.limit
+        limit=args.limit,
+        concurrency=args.concurrency,
+        rpm=args.rpm,
+        cache_dir=None if args.no_cache else ".ruggles_eval_cache",
+        output_format=args.format
     )
     
     # Load custom prompt if provided
@@ -785,4 +911,4 @@ if __name__ == "__main__":
     
     print(f"Evaluating artwork images using {args.model} with {args.sketch_type} mode")
     # Run the evaluation
-    evaluator.run_evaluation()
+    evaluator.run_evaluation(use_batch=args.batch)
@@ -3,17 +3,17 @@ import time
 
 print(f"[{time.time()}] Script started")
 
-from openai import OpenAI
 from utils.image_handler import upload_image
 from utils.db import insert_artwork, get_all_artworks
+from utils.evaluation import build_system_prompt_blocks, build_schema, validate_evaluation
 import os
 from datetime import datetime
-from dotenv import load_dotenv
 import base64
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-import json
-import pandas as pd
-import altair as alt
+import orjson
+import html
+from PIL import Image, ImageOps
 
 print(f"[{time.time()}] Imports completed")
 
@@ -31,15 +31,405 @@ def adjust_score_on_curve(raw_score):
     """
     return raw_score # do not filter
 
+# The Vision API downsamples internally, so full-resolution uploads only cost
+# bandwidth, base64 inflation, and "high detail" image tokens. Cap the longest
+# side at 2048px and re-encode as JPEG before anything leaves the browser box.
+@st.cache_data(max_entries=16, show_spinner=False)
+def preprocess_image(image_bytes):
+    img = Image.open(BytesIO(image_bytes))
+    # Bake in the EXIF orientation tag, which JPEG re-encoding discards —
+    # otherwise phone photos get evaluated sideways
+    img = ImageOps.exif_transpose(img)
+    img.thumbnail((2048, 2048), Image.LANCZOS)
+    if img.mode in ("RGBA", "LA", "P"):
+        # Composite transparency onto white before flattening: a bare
+        # convert("RGB") drops the alpha channel, turning sketches on
+        # transparent backgrounds into black-on-black
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A"))
+        img = background
+    else:
+        img = img.convert("RGB")
+    buf = BytesIO()
+    img.save(buf, "JPEG", quality=85, optimize=True)
+    return buf.getvalue()
+
+# Memoized so reruns and retries with the same upload reuse one encoded buffer
+# instead of re-scanning (and re-allocating) several MB of image per call —
+# cache_data (keyed on the bytes) rather than lru_cache, which would be reset
+# with the function on every rerun. Concatenating at the bytes level and
+# decoding once (ascii — base64 output is pure ASCII) skips the intermediate
+# str copy an f-string would allocate.
+@st.cache_data(max_entries=16, show_spinner=False)
+def build_image_data_url(image_bytes, file_extension):
+    prefix = f"data:image/{file_extension};base64,".encode()
+    return (prefix + base64.b64encode(image_bytes)).decode('ascii')
+
+# One client per session process: reconstructing OpenAI() every rerun pays a
+# fresh TLS handshake on the next request; cache_resource keeps the pooled
+# httpx connections alive across reruns. Cloudinary uploads already reuse the
+# SDK's pooled session configured in utils.image_handler.
+@st.cache_resource
+def get_openai_client(api_key):
+    # Deferred import: the SDK only loads when a client is first built, not
+    # on every cold start of users who never leave the history/about tabs
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+# Bust the evaluation cache automatically whenever the prompt/schema change
+PROMPT_VERSION = "v1"
+
+# Fire-and-forget pool for the post-analysis DB insert: the put_item round-trip
+# no longer sits between the GPT response and the results appearing on screen.
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# Resolving st.secrets touches the secrets store (a filesystem stat plus a
+# swallowed exception when the key is absent) and the lookup runs on every
+# rerun; the key never changes mid-process, so resolve it once. cache_resource,
+# not lru_cache — main-script functions are redefined every rerun, which would
+# reset an lru_cache along with them.
+@st.cache_resource(show_spinner=False)
+def _get_api_key():
+    try:
+        return st.secrets["OPENAI_API_KEY"]
+    except Exception:
+        return os.getenv("OPENAI_API_KEY")
+
+# Repeat submissions of the same image (double-click, rerun, same file twice)
+# skip the multi-second paid GPT call entirely: cache_data keys on the raw
+# image bytes, artist, sketch type, and prompt version. Underscore-prefixed
+# params (client, delivery URL, progress callback) are excluded from the key —
+# the Cloudinary URL changes on every re-upload of identical bytes, so keying
+# on it would defeat the cache.
+@st.cache_data(max_entries=256, show_spinner=False)
+def evaluate_artwork(image_bytes, artist_name, sketch_type, prompt_version, _image_input_url, _client, _on_delta=None):
+    with _client.responses.stream(
+        model="gpt-5.4",
+        input=[
+            {
+                # Static preamble first, mode suffix second, so the shared
+                # prefix stays eligible for OpenAI's prompt caching
+                "role": "system",
+                "content": [
+                    {"type": "input_text", "text": text}
+                    for text in build_system_prompt_blocks(sketch_type)
+                ]
+            },
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "input_text",
+                        "text": f"Here's an artwork by {artist_name}."
+                    },
+                    {
+                        "type": "input_image",
+                        "image_url": _image_input_url
+                    }
+                ]
+            }
+        ],
+        text={
+            "format": {
+                "type": "json_schema",
+                "name": "artwork_evaluation",
+                "schema": build_schema(sketch_type),
+                "strict": True
+            }
+        }
+    ) as stream:
+        for event in stream:
+            if event.type == "response.output_text.delta" and _on_delta:
+                _on_delta(event.delta)
+        return stream.get_final_response().output_text
+
+# Reruns happen on every widget interaction; without this, each one repeats
+# the full DynamoDB query. TTL keeps the history reasonably fresh for other
+# users' inserts; our own inserts clear it explicitly.
+@st.cache_data(ttl=60, show_spinner=False)
+def load_artworks():
+    return get_all_artworks()
+
+def thumb_url(url, width=400):
+    """Rewrite a Cloudinary URL to serve a small auto-format thumbnail.
+
+    Keeps the history list from downloading every full-resolution original;
+    the detail view still uses the untransformed URL.
+    """
+    if url and '/upload/' in url:
+        return url.replace('/upload/', f'/upload/w_{width},q_auto,f_auto/', 1)
+    return url
+
+
+def collect_scores(artwork):
+    """Collect the raw criteria scores that count toward an artwork's average.
+
+    One pass over the shared _CRITERIA table: the quick-sketch criteria always
+    count when present; the full-realism four only when the artwork was
+    evaluated in full realism mode.
+    """
+    evaluation_data = artwork.get('evaluation_data', {})
+    # Default to full realism for backwards compatibility
+    full_realism = artwork.get('sketch_type', 'full realism') == 'full realism'
+    return [
+        evaluation_data[key]['score']
+        for key, _label, realism_only in _CRITERIA
+        if key in evaluation_data and (full_realism or not realism_only)
+    ]
+
+
+# (evaluation_data key, display label, counts only in full realism mode)
+_CRITERIA = (
+    ('proportion_and_structure', 'Proportion & Structure', False),
+    ('line_quality', 'Line Quality', False),
+    ('value_and_light', 'Value & Light', True),
+    ('detail_and_texture', 'Detail & Texture', True),
+    ('composition_and_perspective', 'Composition & Perspective', True),
+    ('form_and_volume', 'Form & Volume', False),
+    ('mood_and_expression', 'Mood & Expression', False),
+    ('overall_realism', 'Overall Realism', True),
+)
+
+
+def _build_results_rows(evaluation_data, sketch_type):
+    """Build the score-table rows (criteria plus average) in a single pass.
+
+    Shared by the fresh-analysis view and the history detail view so the two
+    tables can never drift apart.
+    """
+    results_data = []
+    scores = []
+    full_realism = sketch_type == 'full realism'
+
+    for key, label, realism_only in _CRITERIA:
+        data = evaluation_data.get(key)
+        if data is None or (realism_only and not full_realism):
+            continue
+        raw_score = data['score']
+        scores.append(raw_score)
+        results_data.append({
+            "Criteria": label,
+            "Raw Score": f"{raw_score}/20",
+            "Curved Score": f"{adjust_score_on_curve(raw_score)}/20",
+            "Rationale": data['rationale']
+        })
+
+    if scores:
+        avg_score = sum(scores) / len(scores)
+        curved_avg_score = adjust_score_on_curve(avg_score)
+
+        # Note which criteria were included in the average
+        if sketch_type == 'quick sketch':
+            avg_note = "Average of Quick Sketch criteria (4 aspects)"
+        else:
+            avg_note = "Average of Full Realism criteria (8 aspects)"
+
+        results_data.append({
+            "Criteria": "Average Score",
+            "Raw Score": f"{avg_score:.1f}/20",
+            "Curved Score": f"{curved_avg_score:.1f}/20",
+            "Rationale": avg_note
+        })
+
+    return results_data
+
+
+# Styling for the results tables, defined once at module scope; each view
+# emits it a single time instead of carrying its own copy of the block.
+STYLED_TABLE_CSS = """
+<style>
+.styled-table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 25px 0;
+    font-size: 0.9em;
+    table-layout: fixed;
+}
+.styled-table thead tr {
+    background-color: #f2f2f2;
+    text-align: left;
+}
+.styled-table th,
+.styled-table td {
+    padding: 12px 15px;
+    border: 1px solid #ddd;
+}
+.styled-table th:nth-child(1),
+.styled-table td:nth-child(1) {
+    width: 100px;
+}
+.styled-table th:nth-child(2),
+.styled-table td:nth-child(2) {
+    width: 65px;
+}
+.styled-table th:nth-child(3),
+.styled-table td:nth-child(3) {
+    width: auto;
+}
+</style>
+"""
+
+
+def _results_table_html(rows):
+    """Render the curved-score results rows as one styled-table HTML string.
+
+    A direct string join costs microseconds where the old pandas Styler
+    templated the same handful of static rows through jinja2 on every rerun.
+    """
+    body = "".join(
+        "<tr>"
+        f"<td>{html.escape(str(row['Criteria']))}</td>"
+        f"<td>{html.escape(str(row['Curved Score']))}</td>"
+        f"<td>{html.escape(str(row['Rationale']))}</td>"
+        "</tr>"
+        for row in rows
+    )
+    return (
+        "<table class='styled-table'><thead><tr>"
+        "<th>Criteria</th><th>Curved Score</th><th>Rationale</th>"
+        "</tr></thead><tbody>" + body + "</tbody></table>"
+    )
+
+
+# Stored evaluations are immutable, so the rendered table for a given artwork
+# id never changes; the evaluation dict itself is underscore-excluded from the
+# cache key to skip hashing it on every lookup.
+@st.cache_data(max_entries=500, show_spinner=False)
+def _artwork_table_html(artwork_id, _evaluation_data, sketch_type):
+    return _results_table_html(_build_results_rows(_evaluation_data, sketch_type))
+
+
+def render_improvement_tips(evaluation_data, sketch_type):
+    """Render per-criterion improvement tips, two columns in full realism mode.
+
+    Driven by the same _CRITERIA table as the score rows, so a new criterion
+    automatically gets its tips rendered. Alternating criteria between the
+    columns reproduces the previous hardcoded left/right grouping. Each column
+    is emitted as one escaped HTML string — one websocket delta instead of a
+    separate st.markdown per heading and per bullet.
+    """
+    st.markdown("### Improvement Tips")
+
+    full_realism = sketch_type == 'full realism'
+    n_cols = 2 if full_realism else 1
+    col_chunks = [[] for _ in range(n_cols)]
+    shown = 0
+    for key, label, realism_only in _CRITERIA:
+        data = evaluation_data.get(key)
+        if data is None or (realism_only and not full_realism):
+            continue
+        tips = "".join(f"<li>{html.escape(str(tip))}</li>" for tip in data['improvement_tips'])
+        col_chunks[shown % n_cols].append(f"<strong>{label}:</strong><ul>{tips}</ul>")
+        shown += 1
+
+    targets = st.columns(n_cols) if full_realism else [st]
+    for target, chunks in zip(targets, col_chunks):
+        if chunks:
+            target.markdown("".join(chunks), unsafe_allow_html=True)
+
+
+def render_artwork_detail(artwork):
+    """Render one artwork's image, evaluation table, and improvement tips."""
+    sketch_type = artwork.get('sketch_type', 'full realism')
+    st.image(artwork['image_url'], caption=artwork['title'], width='stretch')
+
+    # Display evaluation data if available
+    if 'evaluation_data' in artwork:
+        evaluation_data = artwork['evaluation_data']
+
+        # Serve the table HTML from the memo when the artwork has an id
+        # (i.e. came from the DB); build it directly otherwise
+        artwork_id = artwork.get('id')
+        if artwork_id:
+            table_html = _artwork_table_html(artwork_id, evaluation_data, sketch_type)
+        else:
+            table_html = _results_table_html(_build_results_rows(evaluation_data, sketch_type))
+
+        # Display the styled table
+        st.write(STYLED_TABLE_CSS, unsafe_allow_html=True)
+
+        st.write(table_html, unsafe_allow_html=True)
+
+        render_improvement_tips(evaluation_data, sketch_type)
+    else:
+        st.write("**Analysis:**", artwork['gpt_response'])
+
+
+def render_analysis_results(evaluation_data, sketch_type):
+    """Render the freshly analyzed artwork's title, score table, and tips."""
+    # Extract and display the generated title
+    generated_title = evaluation_data.get('generated_title', 'Untitled')
+    st.subheader(f"AI-Generated Title: \"{generated_title}\"")
+    
+    # Display the evaluation results
+    st.subheader("Artwork Evaluation")
+    
+    # Build the score table (criteria rows plus the average) in one pass
+    results_data = _build_results_rows(evaluation_data, sketch_type)
+
+    # Display the styled table
+    st.write(STYLED_TABLE_CSS, unsafe_allow_html=True)
+
+    st.write(_results_table_html(results_data), unsafe_allow_html=True)
+
+    render_improvement_tips(evaluation_data, sketch_type)
+
+
+# Static About-tab copy, allocated once at module scope instead of rebuilding
+# the literal inside the tab body on every rerun
+ABOUT_MD = """
+### How It Works
+Ruggles uses openAI to analyze and provide constructive feedback on artwork. The AI evaluates key aspects of your sketch based on the evaluation type you select.
+
+#### Quick Sketch Mode
+Focuses on four fundamental aspects:
+1. **Proportion & Structure** – Accuracy of relative sizes and shapes of elements
+2. **Line Quality** – Confidence, control, and variation in line work
+3. **Form & Volume** – Three-dimensionality and modeling of forms
+4. **Mood & Expression** – Evocation of emotion, mood, or atmosphere
+
+#### Full Realism Mode
+Evaluates all eight aspects of artwork:
+1. **Proportion & Structure** – Accuracy of relative sizes and shapes of elements
+2. **Line Quality** – Confidence, control, and variation in line work
+3. **Value & Light** – Effective use of shading and light for depth and form
+4. **Detail & Texture** – Believability and appropriateness of textures and details
+5. **Composition & Perspective** – Balance of elements and accuracy of perspective
+6. **Form & Volume** – Three-dimensionality and modeling of forms
+7. **Mood & Expression** – Evocation of emotion, mood, or atmosphere
+8. **Overall Realism** – Visual believability and execution
+
+### The Evaluation Process
+For each criteria, Ruggles provides:
+- A score on a scale of 1-20 (where 1 is poor and 20 is excellent)
+- A 1-3 sentence rationale explaining the score
+- 1-3 actionable tips for improvement in that specific area
+
+### Privacy Notice
+- Your artwork will be uploaded to our secure servers for analysis
+- You can choose whether to store your art and evaluation in the database for future reference
+- If you choose to store your artwork, it may be visible to other users of the platform
+"""
+
+
 # Set page config (must be the first Streamlit command)
 st.set_page_config(
     page_title="Ruggles Art Evaluation",
     page_icon="🎨",
 )
 
-# Load environment variables (for local development)
+# Load environment variables (for local development). cache_resource (not
+# lru_cache — main-script functions are redefined every rerun, which would
+# reset an lru_cache) makes this a once-per-process parse of .env.
+@st.cache_resource
+def _load_env():
+    from dotenv import load_dotenv
+    return load_dotenv()
+
+
 print(f"[{time.time()}] Loading environment variables...")
-load_dotenv()
+_load_env()
 print(f"[{time.time()}] Environment variables loaded")
 
 # Show title and description
@@ -50,23 +440,23 @@ print(f"[{time.time()}] Creating tabs...")
 tab1, tab2, tab3 = st.tabs(["Analyze Artwork", "Previous Analyses", "About"])
 print(f"[{time.time()}] Tabs created")
 
-with tab1:
+# Each tab body runs as a fragment: interacting with a widget inside one
+# (e.g. typing in the artist-name box) reruns only that fragment instead of
+# the whole script, so the history fetch/render is skipped on analyze-form
+# keystrokes and vice versa.
+@st.fragment
+def render_analyze_tab():
     print(f"[{time.time()}] Initializing Tab 1: Analyze Artwork")
-    st.write("Upload an artwork image for evaluation! Now with o3!")
+    st.write("Upload artwork images for evaluation! Now with o3!")
 
-    # Get OpenAI API key from Streamlit secrets or environment
-    try:
-        openai_api_key = st.secrets["OPENAI_API_KEY"]
-    except:
-        openai_api_key = os.getenv("OPENAI_API_KEY")
+    # Get OpenAI API key from Streamlit secrets or environment (cached)
+    openai_api_key = _get_api_key()
 
     if not openai_api_key:
         st.error("OpenAI API key not found. Please set OPENAI_API_KEY in your Streamlit secrets or .env file.")
     else:
-        # Create an OpenAI client
-        print(f"[{time.time()}] Creating OpenAI client...")
-        client = OpenAI(api_key=openai_api_key)
-        print(f"[{time.time()}] OpenAI client created")
+        # Reuse the cached OpenAI client across reruns
+        client = get_openai_client(openai_api_key)
 
         # Get artist name first
         artist_name = st.text_input(
@@ -81,16 +471,17 @@ with tab1:
             format="YYYY-MM-DD"
         )
 
-        # Let the user upload an image
-        uploaded_file = st.file_uploader(
-            "Upload an artwork image", 
+        # Let the user upload one or more images
+        uploaded_files = st.file_uploader(
+            "Upload artwork images",
             type=["png", "jpg", "jpeg"],
-            help="Upload an image of artwork to analyze"
+            accept_multiple_files=True,
+            help="Upload one or more images of artwork to analyze"
         )
 
-        # Display the uploaded image if available
-        if uploaded_file:
-            st.image(uploaded_file, caption="Uploaded Artwork", width='stretch')
+        # Display the uploaded images if available
+        if uploaded_files:
+            st.image(uploaded_files, caption=[f.name for f in uploaded_files], width='stretch')
             
         # Add toggle for sketch type
         col1, col2, col3 = st.columns([2, 2, 2])
@@ -117,570 +508,153 @@ with tab1:
         store_in_db = st.checkbox("Store art and evaluation in the Ruggles database for others to see", value=True)
 
         # Analyze Artwork button (disabled until all fields are filled)
-        if st.button("Analyze Artwork", disabled=not (uploaded_file and artist_name)):
+        if st.button("Analyze Artwork", disabled=not (uploaded_files and artist_name)):
             with st.spinner("Analyzing artwork and generating response..."):
-                # Read the file once
-                image_bytes = uploaded_file.read()
-                
-                # Upload image to Cloudinary using the bytes
-                image_data = upload_image(image_bytes)
-                
-                if image_data:
-                    # Convert the bytes to base64
-                    base64_image = base64.b64encode(image_bytes).decode('utf-8')
-                    
-                    # Get the file extension
-                    file_extension = uploaded_file.type.split('/')[-1]
-                    
-                    # Prepare the prompt for GPT - adjusting based on sketch type
-                    system_prompt = """You are an expert art critic and instructor. Evaluate the provided sketch using the following criteria, scoring each one on a scale of 1 to 20 (1 = Poor, 20 = Excellent). For each category, include:
-A 1–3 sentence rationale explaining the score.
-A set of 1–3 actionable tips for how the artist could improve the submitted artwork specifically in each area.
-
-Also, please create a creative title for this artwork based on what you see.
-If you recognize a character, object, or location, please include that in the title.
-
-Evaluation Criteria:
-Proportion & Structure – Are the relative sizes and shapes of elements accurate and well-constructed?
-Line Quality – Are the lines confident, controlled, and varied to define form, contour, or texture effectively?"""
-
-                    # Add additional criteria for full realism mode
-                    if sketch_type == "full realism":
-                        system_prompt += """
-Value & Light – Is there effective use of shading and light to create realistic depth, contrast, and form?
-Detail & Texture – Are the textures believable and appropriate for the subject? Is the level of detail well-judged?
-Composition & Perspective – Is the placement of elements balanced? Is perspective applied accurately?"""
-                    
-                    # Add form and volume, mood and expression for both modes
-                    system_prompt += """
-Form & Volume – Does the drawing feel three-dimensional? Are forms convincingly modeled through shading or structure?
-Mood & Expression – Does the image evoke a mood, emotion, or atmosphere, even subtly?"""
-                    
-                    # Add overall realism for full realism mode only
-                    if sketch_type == "full realism":
-                        system_prompt += """
-Overall Realism – How realistic is the overall sketch in terms of visual believability and execution?"""
-
-                    # Setup the JSON schema based on sketch type
-                    schema = {
-                        "type": "object",
-                        "properties": {
-                            "generated_title": {
-                                "type": "string",
-                                "description": "A creative title for the artwork"
-                            },
-                            "proportion_and_structure": {
-                                "type": "object",
-                                "properties": {
-                                    "score": {
-                                        "type": "integer",
-                                        "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                                    },
-                                    "rationale": {
-                                        "type": "string",
-                                        "description": "1-3 sentence explanation for the score"
-                                    },
-                                    "improvement_tips": {
-                                        "type": "array",
-                                        "items": {
-                                            "type": "string"
-                                        },
-                                        "description": "1-3 actionable tips for improvement"
-                                    }
-                                },
-                                "required": ["score", "rationale", "improvement_tips"],
-                                "additionalProperties": False
-                            },
-                            "line_quality": {
-                                "type": "object",
-                                "properties": {
-                                    "score": {
-                                        "type": "integer",
-                                        "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                                    },
-                                    "rationale": {
-                                        "type": "string",
-                                        "description": "1-3 sentence explanation for the score"
-                                    },
-                                    "improvement_tips": {
-                                        "type": "array",
-                                        "items": {
-                                            "type": "string"
-                                        },
-                                        "description": "1-3 actionable tips for improvement"
-                                    }
-                                },
-                                "required": ["score", "rationale", "improvement_tips"],
-                                "additionalProperties": False
-                            },
-                            "form_and_volume": {
-                                "type": "object",
-                                "properties": {
-                                    "score": {
-                                        "type": "integer",
-                                        "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                                    },
-                                    "rationale": {
-                                        "type": "string",
-                                        "description": "1-3 sentence explanation for the score"
-                                    },
-                                    "improvement_tips": {
-                                        "type": "array",
-                                        "items": {
-                                            "type": "string"
-                                        },
-                                        "description": "1-3 actionable tips for improvement"
-                                    }
-                                },
-                                "required": ["score", "rationale", "improvement_tips"],
-                                "additionalProperties": False
-                            },
-                            "mood_and_expression": {
-                                "type": "object",
-                                "properties": {
-                                    "score": {
-                                        "type": "integer",
-                                        "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                                    },
-                                    "rationale": {
-                                        "type": "string",
-                                        "description": "1-3 sentence explanation for the score"
-                                    },
-                                    "improvement_tips": {
-                                        "type": "array",
-                                        "items": {
-                                            "type": "string"
-                                        },
-                                        "description": "1-3 actionable tips for improvement"
-                                    }
-                                },
-                                "required": ["score", "rationale", "improvement_tips"],
-                                "additionalProperties": False
-                            }
-                        },
-                        "required": ["generated_title", "proportion_and_structure", "line_quality", "form_and_volume", "mood_and_expression"],
-                        "additionalProperties": False
-                    }
-                    
-                    # Add additional schema properties for full realism mode
-                    if sketch_type == "full realism":
-                        schema["properties"]["value_and_light"] = {
-                            "type": "object",
-                            "properties": {
-                                "score": {
-                                    "type": "integer",
-                                    "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                                },
-                                "rationale": {
-                                    "type": "string",
-                                    "description": "1-3 sentence explanation for the score"
-                                },
-                                "improvement_tips": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "string"
-                                    },
-                                    "description": "1-3 actionable tips for improvement"
-                                }
-                            },
-                            "required": ["score", "rationale", "improvement_tips"],
-                            "additionalProperties": False
-                        }
-                        
-                        schema["properties"]["detail_and_texture"] = {
-                            "type": "object",
-                            "properties": {
-                                "score": {
-                                    "type": "integer",
-                                    "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                                },
-                                "rationale": {
-                                    "type": "string",
-                                    "description": "1-3 sentence explanation for the score"
-                                },
-                                "improvement_tips": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "string"
-                                    },
-                                    "description": "1-3 actionable tips for improvement"
-                                }
-                            },
-                            "required": ["score", "rationale", "improvement_tips"],
-                            "additionalProperties": False
-                        }
-                        
-                        schema["properties"]["composition_and_perspective"] = {
-                            "type": "object",
-                            "properties": {
-                                "score": {
-                                    "type": "integer",
-                                    "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                                },
-                                "rationale": {
-                                    "type": "string",
-                                    "description": "1-3 sentence explanation for the score"
-                                },
-                                "improvement_tips": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "string"
-                                    },
-                                    "description": "1-3 actionable tips for improvement"
-                                }
-                            },
-                            "required": ["score", "rationale", "improvement_tips"],
-                            "additionalProperties": False
-                        }
-                        
-                        schema["properties"]["overall_realism"] = {
-                            "type": "object",
-                            "properties": {
-                                "score": {
-                                    "type": "integer",
-                                    "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
-                                },
-                                "rationale": {
-                                    "type": "string",
-                                    "description": "1-3 sentence explanation for the score"
-                                },
-                                "improvement_tips": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "string"
-                                    },
-                                    "description": "1-3 actionable tips for improvement"
-                                }
-                            },
-                            "required": ["score", "rationale", "improvement_tips"],
-                            "additionalProperties": False
-                        }
-                        
-                        # Update required properties for full realism
-                        schema["required"] = ["generated_title", "proportion_and_structure", "line_quality", "value_and_light", 
-                                              "detail_and_texture", "composition_and_perspective", 
-                                              "form_and_volume", "mood_and_expression", "overall_realism"]
-
-                    # Generate an answer using the OpenAI API
-                    response = client.responses.create(
-                        model="gpt-5.4",
-                        input=[
-                            {
-                                "role": "system",
-                                "content": system_prompt
-                            },
-            {
-                "role": "user",
-                                "content": [
-                                    {
-                                        "type": "input_text",
-                                        "text": f"Here's an artwork by {artist_name}."
-                                    },
-                                    {
-                                        "type": "input_image",
-                                        "image_url": f"data:image/{file_extension};base64,{base64_image}"
-                                    }
-                                ]
-                            }
-                        ],
-                        text={
-                            "format": {
-                                "type": "json_schema",
-                                "name": "artwork_evaluation",
-                                "schema": schema,
-                                "strict": True
-                            }
-                        }
+                def analyze_one(uploaded_file, on_delta=None):
+                    """Preprocess, optionally upload, and evaluate one file."""
+                    # getvalue() returns the buffered bytes without moving the
+                    # cursor (read() would return b"" on a rerun after st.image
+                    # already consumed the file) and without an extra copy
+                    image_bytes = preprocess_image(uploaded_file.getvalue())
+
+                    if store_in_db:
+                        # Upload image to Cloudinary using the bytes
+                        image_data = upload_image(image_bytes)
+
+                        if image_data:
+                            # Cloudinary already hosts the bytes; hand OpenAI its URL instead
+                            # of re-uploading a base64 copy inside the request body
+                            image_input_url = image_data["url"]
+                        else:
+                            # Upload failed: fall back to sending the image inline
+                            image_input_url = build_image_data_url(image_bytes, "jpeg")
+                    else:
+                        # Nobody will reference a hosted copy: skip the Cloudinary
+                        # round-trip and send the downscaled image inline
+                        image_data = None
+                        image_input_url = build_image_data_url(image_bytes, "jpeg")
+
+                    output_text = evaluate_artwork(
+                        image_bytes, artist_name, sketch_type, PROMPT_VERSION,
+                        _image_input_url=image_input_url, _client=client, _on_delta=on_delta,
                     )
+                    return image_data, output_text
+
+                progress_area = st.empty()
+                if len(uploaded_files) == 1:
+                    # Single image: stream output_text deltas so the user sees
+                    # progress instead of a blocked spinner
+                    received = [0]
+
+                    def on_delta(delta):
+                        received[0] += len(delta)
+                        progress_area.caption(f"Evaluating… received {received[0]} characters")
+
+                    outcomes = [analyze_one(uploaded_files[0], on_delta)]
+                else:
+                    # Portfolio mode: each file's upload + evaluation is an
+                    # independent network round-trip, so fan out on threads and
+                    # wall time collapses to roughly the slowest file. No
+                    # streaming callbacks here — st.* calls aren't safe off the
+                    # script thread.
+                    progress_area.caption(f"Evaluating {len(uploaded_files)} artworks…")
+                    with ThreadPoolExecutor(max_workers=min(4, len(uploaded_files))) as pool:
+                        outcomes = list(pool.map(analyze_one, uploaded_files))
+                progress_area.empty()
+
+                analyses = []
+                for uploaded_file, (image_data, output_text) in zip(uploaded_files, outcomes):
+                    if store_in_db and not image_data:
+                        st.warning(f"Image upload failed for {uploaded_file.name}; its evaluation will not be saved to the database.")
 
                     # Parse the response
                     try:
-                        evaluation_data = json.loads(response.output_text)
-                        
-                        # Extract and display the generated title
-                        generated_title = evaluation_data.get('generated_title', 'Untitled')
-                        st.subheader(f"AI-Generated Title: \"{generated_title}\"")
-                        
-                        # Display the evaluation results
-                        st.subheader("Artwork Evaluation")
-                        
-                        # Create a table for evaluation results
-                        results_data = []
-                        
-                        # Add proportion and structure data
-                        if 'proportion_and_structure' in evaluation_data:
-                            ps_data = evaluation_data['proportion_and_structure']
-                            raw_score = ps_data['score']
-                            curved_score = adjust_score_on_curve(raw_score)
-                            results_data.append({
-                                "Criteria": "Proportion & Structure",
-                                "Raw Score": f"{raw_score}/20",
-                                "Curved Score": f"{curved_score}/20",
-                                "Rationale": ps_data['rationale']
-                            })
-                        
-                        # Add line quality data
-                        if 'line_quality' in evaluation_data:
-                            lq_data = evaluation_data['line_quality']
-                            raw_score = lq_data['score']
-                            curved_score = adjust_score_on_curve(raw_score)
-                            results_data.append({
-                                "Criteria": "Line Quality",
-                                "Raw Score": f"{raw_score}/20",
-                                "Curved Score": f"{curved_score}/20",
-                                "Rationale": lq_data['rationale']
-                            })
-                        
-                        # For full realism mode, add other criteria
-                        if sketch_type == "full realism":
-                            # Add value and light data
-                            vl_data = evaluation_data['value_and_light']
-                            results_data.append({
-                                "Criteria": "Value & Light",
-                                "Raw Score": f"{vl_data['score']}/20",
-                                "Curved Score": f"{adjust_score_on_curve(vl_data['score'])}/20",
-                                "Rationale": vl_data['rationale']
-                            })
-                            
-                            # Add detail and texture data
-                            dt_data = evaluation_data['detail_and_texture']
-                            results_data.append({
-                                "Criteria": "Detail & Texture",
-                                "Raw Score": f"{dt_data['score']}/20",
-                                "Curved Score": f"{adjust_score_on_curve(dt_data['score'])}/20",
-                                "Rationale": dt_data['rationale']
-                            })
-                            
-                            # Add composition and perspective data
-                            cp_data = evaluation_data['composition_and_perspective']
-                            results_data.append({
-                                "Criteria": "Composition & Perspective",
-                                "Raw Score": f"{cp_data['score']}/20",
-                                "Curved Score": f"{adjust_score_on_curve(cp_data['score'])}/20",
-                                "Rationale": cp_data['rationale']
-                            })
-                        
-                        # Add form and volume data
-                        fv_data = evaluation_data['form_and_volume']
-                        results_data.append({
-                            "Criteria": "Form & Volume",
-                            "Raw Score": f"{fv_data['score']}/20",
-                            "Curved Score": f"{adjust_score_on_curve(fv_data['score'])}/20",
-                            "Rationale": fv_data['rationale']
-                        })
-                        
-                        # Add mood and expression data
-                        me_data = evaluation_data['mood_and_expression']
-                        results_data.append({
-                            "Criteria": "Mood & Expression",
-                            "Raw Score": f"{me_data['score']}/20",
-                            "Curved Score": f"{adjust_score_on_curve(me_data['score'])}/20",
-                            "Rationale": me_data['rationale']
-                        })
-                        
-                        # Add overall realism data for full realism mode
-                        if sketch_type == "full realism":
-                            or_data = evaluation_data['overall_realism']
-                            results_data.append({
-                                "Criteria": "Overall Realism",
-                                "Raw Score": f"{or_data['score']}/20",
-                                "Curved Score": f"{adjust_score_on_curve(or_data['score'])}/10",
-                                "Rationale": or_data['rationale']
-                            })
-                        
-                        # Calculate average score based on available criteria
-                        scores = []
-                        scores.append(ps_data['score'])
-                        scores.append(lq_data['score'])
-                        
-                        if sketch_type == "full realism":
-                            scores.append(vl_data['score'])
-                            scores.append(dt_data['score'])
-                            scores.append(cp_data['score'])
-                            
-                        scores.append(fv_data['score'])
-                        scores.append(me_data['score'])
-                        
-                        if sketch_type == "full realism":
-                            scores.append(or_data['score'])
-                        
-                        avg_score = sum(scores) / len(scores)
-                        curved_avg_score = adjust_score_on_curve(avg_score)
-                        avg_score_text = f" - Curved: {curved_avg_score:.1f}/20"
-                        
-                        # Add average score row with a note about which criteria were included
-                        if sketch_type == 'quick sketch':
-                            avg_note = "Average of Quick Sketch criteria (4 aspects)"
-                        else:
-                            avg_note = "Average of Full Realism criteria (8 aspects)"
-                            
-                        results_data.append({
-                            "Criteria": "Average Score",
-                            "Raw Score": f"{avg_score:.1f}/20",
-                            "Curved Score": f"{curved_avg_score:.1f}/20",
-                            "Rationale": avg_note
-                        })
-                        
-                        # Convert to DataFrame
-                        df = pd.DataFrame(results_data)
-                        
-                        # Use pandas styling to generate a styled HTML table
-                        styled_df = df.style.set_properties(**{
-                            'text-align': 'left',
-                            'border': '1px solid #ddd',
-                            'padding': '8px'
-                        }).set_table_styles([
-                            {'selector': 'th', 'props': [('background-color', '#f2f2f2'), 
-                                                        ('border', '1px solid #ddd'),
-                                                        ('padding', '8px'),
-                                                        ('text-align', 'left')]},
-                            {'selector': 'tr:hover', 'props': [('background-color', '#f9f9f9')]}
-                        ]).hide(axis="index")
-                        
-                        # Display the styled table
-                        st.write("""
-                        <style>
-                        .styled-table {
-                            width: 100%;
-                            border-collapse: collapse;
-                            margin: 25px 0;
-                            font-size: 0.9em;
-                            table-layout: fixed;
-                        }
-                        .styled-table thead tr {
-                            background-color: #f2f2f2;
-                            text-align: left;
-                        }
-                        .styled-table th,
-                        .styled-table td {
-                            padding: 12px 15px;
-                            border: 1px solid #ddd;
-                        }
-                        .styled-table th:nth-child(1),
-                        .styled-table td:nth-child(1) {
-                            width: 100px;
-                        }
-                        .styled-table th:nth-child(2),
-                        .styled-table td:nth-child(2) {
-                            width: 65px;
-                        }
-                        .styled-table th:nth-child(3),
-                        .styled-table td:nth-child(3) {
-                            width: auto;
+                        evaluation_data = orjson.loads(output_text)
+                    except orjson.JSONDecodeError:
+                        st.error(f"Error parsing the evaluation response for {uploaded_file.name}. Please try again.")
+                        st.markdown(output_text)
+                        continue
+
+                    # Catch an off-schema response up front instead of
+                    # KeyErroring halfway through the render
+                    missing = validate_evaluation(evaluation_data, sketch_type)
+                    if missing:
+                        st.error(f"The evaluation response for {uploaded_file.name} was incomplete (missing: {', '.join(missing)}). Please try again.")
+                        continue
+
+                    analyses.append({
+                        "name": uploaded_file.name,
+                        "evaluation_data": evaluation_data,
+                        "sketch_type": sketch_type,
+                    })
+
+                    # Store the data in the database if checkbox is checked (needs a
+                    # successful Cloudinary upload to have a URL worth saving)
+                    if store_in_db and image_data:
+                        artwork_data = {
+                            "title": evaluation_data.get('generated_title', 'Untitled'),
+                            "description": "Standard evaluation v0",
+                            "image_url": image_data["url"],
+                            "image_public_id": image_data["public_id"],
+                            "artist_name": artist_name,
+                            "created_at": datetime.now().isoformat(),
+                            "artwork_date": artwork_date.strftime('%Y-%m-%d'),
+                            "sketch_type": sketch_type,
+                            "question": "Standard evaluation v0",
+                            "gpt_response": output_text,
+                            "evaluation_data": evaluation_data
                         }
-                        </style>
-                        """, unsafe_allow_html=True)
-                        
-                        # Create new DataFrame with only curved scores
-                        curved_df = df.drop(columns=['Raw Score'])
-                        styled_curved_df = curved_df.style.set_properties(**{
-                            'text-align': 'left',
-                            'border': '1px solid #ddd',
-                            'padding': '8px'
-                        }).set_table_styles([
-                            {'selector': 'th', 'props': [('background-color', '#f2f2f2'), 
-                                                        ('border', '1px solid #ddd'),
-                                                        ('padding', '8px'),
-                                                        ('text-align', 'left')]},
-                            {'selector': 'tr:hover', 'props': [('background-color', '#f9f9f9')]}
-                        ]).hide(axis="index")
-                        
-                        st.write(styled_curved_df.to_html(classes='styled-table'), unsafe_allow_html=True)
-                        
-                        # Display improvement tips without nested expanders
-                        st.markdown("### Improvement Tips")
-                        
-                        # Use columns for the improvement tips - adjust based on sketch type
-                        if sketch_type == "full realism":
-                            col1, col2 = st.columns(2)
-                            
-                            with col1:
-                                st.markdown("**Proportion & Structure:**")
-                                for tip in ps_data['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                                    
-                                st.markdown("**Value & Light:**")
-                                for tip in vl_data['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                                    
-                                st.markdown("**Composition & Perspective:**")
-                                for tip in cp_data['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                                    
-                                st.markdown("**Mood & Expression:**")
-                                for tip in me_data['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                            
-                            with col2:
-                                st.markdown("**Line Quality:**")
-                                for tip in lq_data['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                                    
-                                st.markdown("**Detail & Texture:**")
-                                for tip in dt_data['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                                    
-                                st.markdown("**Form & Volume:**")
-                                for tip in fv_data['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                                    
-                                st.markdown("**Overall Realism:**")
-                                for tip in or_data['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                        else:
-                            # For quick sketch mode, use single column layout
-                            st.markdown("**Proportion & Structure:**")
-                            for tip in ps_data['improvement_tips']:
-                                st.markdown(f"- {tip}")
-                                
-                            st.markdown("**Line Quality:**")
-                            for tip in lq_data['improvement_tips']:
-                                st.markdown(f"- {tip}")
-                                
-                            st.markdown("**Form & Volume:**")
-                            for tip in fv_data['improvement_tips']:
-                                st.markdown(f"- {tip}")
-                                
-                            st.markdown("**Mood & Expression:**")
-                            for tip in me_data['improvement_tips']:
-                                st.markdown(f"- {tip}")
-                        
-                        # Store the data in the database if checkbox is checked
-                        if store_in_db:
-                            artwork_data = {
-                                "title": generated_title,
-                                "description": "Standard evaluation v0",
-                                "image_url": image_data["url"],
-                                "image_public_id": image_data["public_id"],
-                                "artist_name": artist_name,
-                                "created_at": datetime.now().isoformat(),
-                                "artwork_date": artwork_date.strftime('%Y-%m-%d'),
-                                "sketch_type": sketch_type,
-                                "question": "Standard evaluation v0",
-                                "gpt_response": response.output_text,
-                                "evaluation_data": evaluation_data
-                            }
-                            
-                            # Debug output to confirm sketch type
-                            st.caption(f"Saving with sketch type: **{sketch_type}**")
-                            
-                            result = insert_artwork(artwork_data)
-                            if result:
-                                st.success("Analysis saved successfully!")
-                                # Confirm the sketch type was saved
-                                st.info(f"Your {sketch_type} evaluation has been stored in the database.")
-                    except json.JSONDecodeError:
-                        st.error("Error parsing the evaluation response. Please try again.")
-                        st.markdown(response.output_text)
+
+                        # Insert in the background so the results render now; the
+                        # outcome surfaces as a toast on the next rerun.
+                        st.session_state.setdefault('pending_inserts', []).append(
+                            _IO_EXECUTOR.submit(insert_artwork, artwork_data)
+                        )
+                        st.info(f"Your {sketch_type} evaluation of {uploaded_file.name} is being saved to the database.")
+
+                if analyses:
+                    # Keep the results across reruns so later interactions
+                    # (filters, toggles) re-display them without more GPT calls
+                    st.session_state['last_analyses'] = analyses
+
+        # Surface the outcomes of background inserts as their futures resolve
+        pending_inserts = st.session_state.get('pending_inserts', [])
+        if pending_inserts:
+            still_pending = []
+            for fut in pending_inserts:
+                if not fut.done():
+                    still_pending.append(fut)
+                elif fut.exception() is None and fut.result():
+                    # Bust the history cache so the new row shows up immediately
+                    load_artworks.clear()
+                    st.toast("Analysis saved successfully!")
+                else:
+                    st.toast("Saving an analysis failed; it will not appear in history.", icon="⚠️")
+            st.session_state['pending_inserts'] = still_pending
+
+        # Render the most recent analyses on every rerun (survives interactions)
+        last_analyses = st.session_state.get('last_analyses', [])
+        for analysis in last_analyses:
+            if len(last_analyses) > 1:
+                st.divider()
+                st.caption(analysis['name'])
+            render_analysis_results(analysis['evaluation_data'], analysis['sketch_type'])
     print(f"[{time.time()}] Tab 1 initialized")
 
-with tab2:
+
+@st.fragment
+def render_history_tab():
     print(f"[{time.time()}] Initializing Tab 2: Previous Analyses")
+    # Deferred: pandas and altair are only used by this tab, and together they
+    # dominate the cold-start import time of the whole script
+    import pandas as pd
+    import altair as alt
+
     st.header("Previous Analyses")
     
-    # Get all artworks first
+    # Get all artworks (cached across reruns for up to a minute)
     print(f"[{time.time()}] Fetching all artworks from DB...")
-    artworks = get_all_artworks()
+    artworks = load_artworks()
     print(f"[{time.time()}] Fetched {len(artworks) if artworks else 0} artworks")
 
     if artworks:
@@ -702,54 +676,47 @@ with tab2:
         # Sort filtered artworks by artwork_date in descending order
         filtered_artworks.sort(key=lambda x: x.get('artwork_date', x.get('created_at', '')), reverse=True)
         
-        # Prepare data for scatter plot if we have filtered results
+        # One pass per artwork: scores and the curved average are computed
+        # once and shared by the chart data, the summary table, and the
+        # detail labels instead of once per consumer.
+        plot_data = []
+        summary_rows = []
+        detail_labels = []
+        for artwork in filtered_artworks:
+            scores = collect_scores(artwork)
+            avg_score = sum(scores) / len(scores) if scores else None
+            curved_avg = adjust_score_on_curve(avg_score) if avg_score is not None else None
+            sketch_type = artwork.get('sketch_type', 'full realism')
+            created_at = artwork.get('created_at', '')
+            # partition scans once and returns the whole string when no 'T'
+            created_date = created_at.partition('T')[0]
+            title = artwork.get('title', 'Untitled')
+            artist_name = artwork.get('artist_name', 'Unknown')
+
+            if avg_score is not None and 'created_at' in artwork:
+                # Plot by artwork_date (when the art was created) rather than
+                # created_at (when it was uploaded)
+                plot_data.append({
+                    'date': artwork.get('artwork_date', created_date),
+                    'raw_score': avg_score,
+                    'curved_score': curved_avg,
+                    'artist': artist_name,
+                    'title': title,
+                    'sketch_type': sketch_type
+                })
+
+            summary_rows.append({
+                "Image": thumb_url(artwork.get('image_url')),
+                "Artist": artist_name,
+                "Title": title,
+                "Created": artwork.get('artwork_date', created_date),
+                "Type": sketch_type.title(),
+                "Curved Avg": round(curved_avg, 1) if curved_avg is not None else None,
+            })
+            avg_text = f" - Curved: {curved_avg:.1f}/20" if curved_avg is not None else ""
+            detail_labels.append(f"{artist_name} - \"{title}\" - {created_date}{avg_text}")
+
         if filtered_artworks:
-            plot_data = []
-            for artwork in filtered_artworks:
-                if 'evaluation_data' in artwork and 'created_at' in artwork:
-                    # Calculate average score based on sketch type
-                    scores = []
-                    evaluation_data = artwork['evaluation_data']
-                    
-                    # Core criteria (quick sketch)
-                    if 'proportion_and_structure' in evaluation_data:
-                        scores.append(evaluation_data['proportion_and_structure']['score'])
-                    if 'line_quality' in evaluation_data:
-                        scores.append(evaluation_data['line_quality']['score'])
-                    if 'form_and_volume' in evaluation_data:
-                        scores.append(evaluation_data['form_and_volume']['score'])
-                    if 'mood_and_expression' in evaluation_data:
-                        scores.append(evaluation_data['mood_and_expression']['score'])
-                    
-                    # Additional criteria (full realism)
-                    sketch_type = artwork.get('sketch_type', 'full realism')
-                    if sketch_type == 'full realism':
-                        if 'value_and_light' in evaluation_data:
-                            scores.append(evaluation_data['value_and_light']['score'])
-                        if 'detail_and_texture' in evaluation_data:
-                            scores.append(evaluation_data['detail_and_texture']['score'])
-                        if 'composition_and_perspective' in evaluation_data:
-                            scores.append(evaluation_data['composition_and_perspective']['score'])
-                        if 'overall_realism' in evaluation_data:
-                            scores.append(evaluation_data['overall_realism']['score'])
-                    
-                    if scores:
-                        avg_score = sum(scores) / len(scores)
-                        # Calculate curved average score
-                        curved_avg_score = adjust_score_on_curve(avg_score)
-                        
-                        # Extract date from artwork_date (when the art was created) instead of created_at (when it was uploaded)
-                        artwork_date = artwork.get('artwork_date', artwork['created_at'].split('T')[0] if 'T' in artwork['created_at'] else artwork['created_at'])
-                        
-                        plot_data.append({
-                            'date': artwork_date,
-                            'raw_score': avg_score,
-                            'curved_score': curved_avg_score,
-                            'artist': artwork.get('artist_name', 'Unknown'),
-                            'title': artwork.get('title', 'Untitled'),
-                            'sketch_type': sketch_type
-                        })
-            
             # Create scatter plot if we have data
             if plot_data:
                 st.subheader("Score Progression Over Time")
@@ -798,350 +765,43 @@ with tab2:
         # Display the filtered artworks
         st.subheader(f"{'All' if selected_artist == 'All Artists' else selected_artist}'s Artwork Evaluations")
         print(f"[{time.time()}] Rendering artwork list...")
-        for index, artwork in enumerate(filtered_artworks):
-            print(f"[{time.time()}] Rendering artwork index {index}...")
-            # Calculate average score for expander header if evaluation data exists
-            avg_score_text = ""
-            if 'evaluation_data' in artwork:
-                evaluation_data = artwork['evaluation_data']
-                
-                # Calculate average score based on sketch type
-                scores = []
-                
-                # Always include core criteria if they exist
-                if 'proportion_and_structure' in evaluation_data:
-                    scores.append(evaluation_data['proportion_and_structure']['score'])
-                if 'line_quality' in evaluation_data:
-                    scores.append(evaluation_data['line_quality']['score'])
-                if 'form_and_volume' in evaluation_data:
-                    scores.append(evaluation_data['form_and_volume']['score'])
-                if 'mood_and_expression' in evaluation_data:
-                    scores.append(evaluation_data['mood_and_expression']['score'])
-                
-                # Only include full realism criteria if the sketch type is full realism
-                sketch_type = artwork.get('sketch_type', 'full realism')  # Default to full realism for backwards compatibility
-                if sketch_type == 'full realism':
-                    if 'value_and_light' in evaluation_data:
-                        scores.append(evaluation_data['value_and_light']['score'])
-                    if 'detail_and_texture' in evaluation_data:
-                        scores.append(evaluation_data['detail_and_texture']['score'])
-                    if 'composition_and_perspective' in evaluation_data:
-                        scores.append(evaluation_data['composition_and_perspective']['score'])
-                    if 'overall_realism' in evaluation_data:
-                        scores.append(evaluation_data['overall_realism']['score'])
-                
-                if scores:
-                    avg_score = sum(scores) / len(scores)
-                    curved_avg_score = adjust_score_on_curve(avg_score)
-                    avg_score_text = f" - Curved: {curved_avg_score:.1f}/20"
-            
-            # Format the date to show only YYYY-MM-DD
-            created_date = artwork['created_at'].split('T')[0] if 'T' in artwork['created_at'] else artwork['created_at']
-            
-            # Get artwork date if available
-            artwork_date_display = ""
-            if 'artwork_date' in artwork:
-                artwork_date_display = f" - Created on: {artwork['artwork_date']}"
-                
-            # Get sketch type if available
-            sketch_type_display = ""
-            if 'sketch_type' in artwork:
-                sketch_type_display = f" - Type: {artwork['sketch_type'].title()}"
-                
-            # Get title if available
-            artwork_title = artwork.get('title', 'Untitled')
-            title_display = f" - \"{artwork_title}\""
-                
-            with st.expander(f"Artwork by {artwork['artist_name']}{title_display} - {created_date}{artwork_date_display}{sketch_type_display}{avg_score_text}"):
-                st.image(artwork['image_url'], caption=artwork['title'], width='stretch')
-                
-                # Display evaluation data if available
-                if 'evaluation_data' in artwork:
-                    evaluation_data = artwork['evaluation_data']
-                    
-                    # Create a table for evaluation results
-                    results_data = []
-                    
-                    # Add proportion and structure data
-                    if 'proportion_and_structure' in evaluation_data:
-                        ps_data = evaluation_data['proportion_and_structure']
-                        raw_score = ps_data['score']
-                        curved_score = adjust_score_on_curve(raw_score)
-                        results_data.append({
-                            "Criteria": "Proportion & Structure",
-                            "Raw Score": f"{raw_score}/20",
-                            "Curved Score": f"{curved_score}/20",
-                            "Rationale": ps_data['rationale']
-                        })
-                    
-                    # Add line quality data
-                    if 'line_quality' in evaluation_data:
-                        lq_data = evaluation_data['line_quality']
-                        raw_score = lq_data['score']
-                        curved_score = adjust_score_on_curve(raw_score)
-                        results_data.append({
-                            "Criteria": "Line Quality",
-                            "Raw Score": f"{raw_score}/20",
-                            "Curved Score": f"{curved_score}/20",
-                            "Rationale": lq_data['rationale']
-                        })
-                    
-                    # Add additional criteria if they exist in the evaluation data
-                    if 'value_and_light' in evaluation_data:
-                        vl_data = evaluation_data['value_and_light']
-                        results_data.append({
-                            "Criteria": "Value & Light",
-                            "Raw Score": f"{vl_data['score']}/20",
-                            "Curved Score": f"{adjust_score_on_curve(vl_data['score'])}/20",
-                            "Rationale": vl_data['rationale']
-                        })
-                    
-                    if 'detail_and_texture' in evaluation_data:
-                        dt_data = evaluation_data['detail_and_texture']
-                        results_data.append({
-                            "Criteria": "Detail & Texture",
-                            "Raw Score": f"{dt_data['score']}/20",
-                            "Curved Score": f"{adjust_score_on_curve(dt_data['score'])}/20",
-                            "Rationale": dt_data['rationale']
-                        })
-                    
-                    if 'composition_and_perspective' in evaluation_data:
-                        cp_data = evaluation_data['composition_and_perspective']
-                        results_data.append({
-                            "Criteria": "Composition & Perspective",
-                            "Raw Score": f"{cp_data['score']}/20",
-                            "Curved Score": f"{adjust_score_on_curve(cp_data['score'])}/20",
-                            "Rationale": cp_data['rationale']
-                        })
-                    
-                    if 'form_and_volume' in evaluation_data:
-                        fv_data = evaluation_data['form_and_volume']
-                        results_data.append({
-                            "Criteria": "Form & Volume",
-                            "Raw Score": f"{fv_data['score']}/20",
-                            "Curved Score": f"{adjust_score_on_curve(fv_data['score'])}/20",
-                            "Rationale": fv_data['rationale']
-                        })
-                    
-                    if 'mood_and_expression' in evaluation_data:
-                        me_data = evaluation_data['mood_and_expression']
-                        results_data.append({
-                            "Criteria": "Mood & Expression",
-                            "Raw Score": f"{me_data['score']}/20",
-                            "Curved Score": f"{adjust_score_on_curve(me_data['score'])}/20",
-                            "Rationale": me_data['rationale']
-                        })
-                    
-                    if 'overall_realism' in evaluation_data:
-                        or_data = evaluation_data['overall_realism']
-                        results_data.append({
-                            "Criteria": "Overall Realism",
-                            "Raw Score": f"{or_data['score']}/20",
-                            "Curved Score": f"{adjust_score_on_curve(or_data['score'])}/20",
-                            "Rationale": or_data['rationale']
-                        })
-                    
-                    # Calculate average score based on available criteria
-                    if scores:
-                        avg_score = sum(scores) / len(scores)
-                        curved_avg_score = adjust_score_on_curve(avg_score)
-                        avg_score_text = f" - Curved: {curved_avg_score:.1f}/20"
-                        
-                        # Add average score row with a note about which criteria were included
-                        if sketch_type == 'quick sketch':
-                            avg_note = "Average of Quick Sketch criteria (4 aspects)"
-                        else:
-                            avg_note = "Average of Full Realism criteria (8 aspects)"
-                            
-                        results_data.append({
-                            "Criteria": "Average Score",
-                            "Raw Score": f"{avg_score:.1f}/20",
-                            "Curved Score": f"{curved_avg_score:.1f}/20",
-                            "Rationale": avg_note
-                        })
-                    
-                    # Convert to DataFrame
-                    df = pd.DataFrame(results_data)
-                    
-                    # Use pandas styling to generate a styled HTML table
-                    styled_df = df.style.set_properties(**{
-                        'text-align': 'left',
-                        'border': '1px solid #ddd',
-                        'padding': '8px'
-                    }).set_table_styles([
-                        {'selector': 'th', 'props': [('background-color', '#f2f2f2'), 
-                                                    ('border', '1px solid #ddd'),
-                                                    ('padding', '8px'),
-                                                    ('text-align', 'left')]},
-                        {'selector': 'tr:hover', 'props': [('background-color', '#f9f9f9')]}
-                    ]).hide(axis="index")
-                    
-                    # Display the styled table
-                    st.write("""
-                    <style>
-                    .styled-table {
-                        width: 100%;
-                        border-collapse: collapse;
-                        margin: 25px 0;
-                        font-size: 0.9em;
-                        table-layout: fixed;
-                    }
-                    .styled-table thead tr {
-                        background-color: #f2f2f2;
-                        text-align: left;
-                    }
-                    .styled-table th,
-                    .styled-table td {
-                        padding: 12px 15px;
-                        border: 1px solid #ddd;
-                    }
-                    .styled-table th:nth-child(1),
-                    .styled-table td:nth-child(1) {
-                        width: 100px;
-                    }
-                    .styled-table th:nth-child(2),
-                    .styled-table td:nth-child(2) {
-                        width: 65px;
-                    }
-                    .styled-table th:nth-child(3),
-                    .styled-table td:nth-child(3) {
-                        width: auto;
-                    }
-                    </style>
-                    """, unsafe_allow_html=True)
-                    
-                    # Create new DataFrame with only curved scores
-                    curved_df = df.drop(columns=['Raw Score'])
-                    styled_curved_df = curved_df.style.set_properties(**{
-                        'text-align': 'left',
-                        'border': '1px solid #ddd',
-                        'padding': '8px'
-                    }).set_table_styles([
-                        {'selector': 'th', 'props': [('background-color', '#f2f2f2'), 
-                                                    ('border', '1px solid #ddd'),
-                                                    ('padding', '8px'),
-                                                    ('text-align', 'left')]},
-                        {'selector': 'tr:hover', 'props': [('background-color', '#f9f9f9')]}
-                    ]).hide(axis="index")
-                    
-                    st.write(styled_curved_df.to_html(classes='styled-table'), unsafe_allow_html=True)
-                    
-                    # Display improvement tips without nested expanders
-                    st.markdown("### Improvement Tips")
-                    
-                    # Use columns for the improvement tips if in Full Realism mode
-                    if ('sketch_type' in artwork and artwork['sketch_type'] == 'full realism') or \
-                       ('value_and_light' in evaluation_data and 'detail_and_texture' in evaluation_data):
-                        col1, col2 = st.columns(2)
-                        
-                        # Left column
-                        with col1:
-                            if 'proportion_and_structure' in evaluation_data:
-                                st.markdown("**Proportion & Structure:**")
-                                for tip in evaluation_data['proportion_and_structure']['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                                
-                            if 'value_and_light' in evaluation_data:
-                                st.markdown("**Value & Light:**")
-                                for tip in evaluation_data['value_and_light']['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                                    
-                            if 'composition_and_perspective' in evaluation_data:
-                                st.markdown("**Composition & Perspective:**")
-                                for tip in evaluation_data['composition_and_perspective']['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                                    
-                            if 'mood_and_expression' in evaluation_data:
-                                st.markdown("**Mood & Expression:**")
-                                for tip in evaluation_data['mood_and_expression']['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                        
-                        # Right column            
-                        with col2:
-                            if 'line_quality' in evaluation_data:
-                                st.markdown("**Line Quality:**")
-                                for tip in evaluation_data['line_quality']['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                                
-                            if 'detail_and_texture' in evaluation_data:
-                                st.markdown("**Detail & Texture:**")
-                                for tip in evaluation_data['detail_and_texture']['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                                    
-                            if 'form_and_volume' in evaluation_data:
-                                st.markdown("**Form & Volume:**")
-                                for tip in evaluation_data['form_and_volume']['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                                    
-                            if 'overall_realism' in evaluation_data:
-                                st.markdown("**Overall Realism:**")
-                                for tip in evaluation_data['overall_realism']['improvement_tips']:
-                                    st.markdown(f"- {tip}")
-                    else:
-                        # For quick sketch mode, use single column layout
-                        if 'proportion_and_structure' in evaluation_data:
-                            st.markdown("**Proportion & Structure:**")
-                            for tip in evaluation_data['proportion_and_structure']['improvement_tips']:
-                                st.markdown(f"- {tip}")
-                            
-                        if 'line_quality' in evaluation_data:
-                            st.markdown("**Line Quality:**")
-                            for tip in evaluation_data['line_quality']['improvement_tips']:
-                                st.markdown(f"- {tip}")
-                            
-                        if 'form_and_volume' in evaluation_data:
-                            st.markdown("**Form & Volume:**")
-                            for tip in evaluation_data['form_and_volume']['improvement_tips']:
-                                st.markdown(f"- {tip}")
-                            
-                        if 'mood_and_expression' in evaluation_data:
-                            st.markdown("**Mood & Expression:**")
-                            for tip in evaluation_data['mood_and_expression']['improvement_tips']:
-                                st.markdown(f"- {tip}")
-                else:
-                    st.write("**Analysis:**", artwork['gpt_response'])
-            print(f"[{time.time()}] Rendered artwork index {index}")
+
+        # One sortable summary table plus a single detail view: rebuilding an
+        # expander full of widgets per artwork made rerun cost O(N) in history
+        # size, which dominated render time past a few dozen analyses.
+        st.dataframe(
+            pd.DataFrame(summary_rows),
+            hide_index=True,
+            width='stretch',
+            column_config={"Image": st.column_config.ImageColumn("Image")},
+        )
+
+        # Select by position: labels aren't guaranteed unique (same artist,
+        # title, date, and score collapse), and .index() on the label would
+        # always resolve a duplicate to its first occurrence
+        selected_index = st.selectbox(
+            "View details for",
+            options=range(len(filtered_artworks)),
+            format_func=detail_labels.__getitem__,
+        )
+        if selected_index is not None:
+            render_artwork_detail(filtered_artworks[selected_index])
         print(f"[{time.time()}] Artwork list rendered")
     print(f"[{time.time()}] Tab 2 initialized")
 
+
+with tab1:
+    render_analyze_tab()
+
+with tab2:
+    render_history_tab()
+
 with tab3:
     print(f"[{time.time()}] Initializing Tab 3: About")
     st.header("About Ruggles Artwork Analysis")
-    
-    st.markdown("""
-    ### How It Works
-    Ruggles uses openAI to analyze and provide constructive feedback on artwork. The AI evaluates key aspects of your sketch based on the evaluation type you select.
-    
-    #### Quick Sketch Mode
-    Focuses on four fundamental aspects:
-    1. **Proportion & Structure** – Accuracy of relative sizes and shapes of elements
-    2. **Line Quality** – Confidence, control, and variation in line work 
-    3. **Form & Volume** – Three-dimensionality and modeling of forms
-    4. **Mood & Expression** – Evocation of emotion, mood, or atmosphere
-    
-    #### Full Realism Mode
-    Evaluates all eight aspects of artwork:
-    1. **Proportion & Structure** – Accuracy of relative sizes and shapes of elements
-    2. **Line Quality** – Confidence, control, and variation in line work
-    3. **Value & Light** – Effective use of shading and light for depth and form
-    4. **Detail & Texture** – Believability and appropriateness of textures and details
-    5. **Composition & Perspective** – Balance of elements and accuracy of perspective
-    6. **Form & Volume** – Three-dimensionality and modeling of forms
-    7. **Mood & Expression** – Evocation of emotion, mood, or atmosphere
-    8. **Overall Realism** – Visual believability and execution
-    
-    ### The Evaluation Process
-    For each criteria, Ruggles provides:
-    - A score on a scale of 1-20 (where 1 is poor and 20 is excellent)
-    - A 1-3 sentence rationale explaining the score
-    - 1-3 actionable tips for improvement in that specific area
-    
-    ### Privacy Notice
-    - Your artwork will be uploaded to our secure servers for analysis
-    - You can choose whether to store your art and evaluation in the database for future reference
-    - If you choose to store your artwork, it may be visible to other users of the platform
-    """)
-    
+
+    st.markdown(ABOUT_MD)
+
     st.info("Ruggles is designed to provide constructive feedback to help artists improve their skills. The evaluations are meant to be helpful and encouraging, not discouraging or harsh.")
     print(f"[{time.time()}] Tab 3 initialized")
 
@@ -16,7 +16,7 @@ ENTITY_TYPE = "artwork"
 
 # Maps the flat DDB columns back to the nested evaluation_data shape the UI expects.
 # (pretty_key, flat_prefix)
-_EVAL_GROUPS = [
+_EVAL_GROUPS = (
     ("proportion_and_structure", "proportion"),
     ("line_quality", "line_quality"),
     ("value_and_light", "value_light"),
@@ -25,7 +25,7 @@ _EVAL_GROUPS = [
     ("form_and_volume", "form_volume"),
     ("mood_and_expression", "mood_expression"),
     ("overall_realism", "overall_realism"),
-]
+)
 
 
 @st.cache_resource
@@ -82,8 +82,6 @@ def insert_artwork(artwork_data: dict):
         if sketch_type not in ("quick sketch", "full realism"):
             sketch_type = "full realism"
 
-        st.write(f"Debug - Inserting with sketch type: {sketch_type}")
-
         now = datetime.now(timezone.utc)
         item = {
             "id": str(uuid.uuid4()),
@@ -132,7 +130,9 @@ def insert_artwork(artwork_data: dict):
         table.put_item(Item=item)
         return item
     except Exception as e:
-        st.error(f"Error inserting data: {str(e)}")
+        # May run on a background thread (no ScriptRunContext), so log instead
+        # of calling st.error; the caller reports failures to the UI.
+        print(f"Error inserting data: {str(e)}")
         return None
 
 
@@ -0,0 +1,165 @@
+"""
+Shared evaluation prompt and JSON-schema builders.
+
+Used by both the Streamlit app and the offline evaluation script so the two
+entrypoints always send the identical payload to the model. Deliberately free
+of Streamlit imports so evaluate_images.py can run outside the app.
+
+Both builders are memoized, so callers receive a shared object per sketch
+type: pass it into request payloads by reference, never mutate it.
+"""
+
+import copy
+import functools
+
+# Byte-identical across sketch types; everything mode-specific lives in the
+# suffix block so the tokenized prefix matches between modes.
+_PROMPT_PREAMBLE = """You are an expert art critic and instructor. Evaluate the provided sketch using the following criteria, scoring each one on a scale of 1 to 20 (1 = Poor, 20 = Excellent). For each category, include:
+A 1–3 sentence rationale explaining the score.
+A set of 1–3 actionable tips for how the artist could improve the submitted artwork specifically in each area.
+
+Also, please create a creative title for this artwork based on what you see.
+If you recognize a character, object, or location, please include that in the title.
+
+Evaluation Criteria:
+Proportion & Structure – Are the relative sizes and shapes of elements accurate and well-constructed?
+Line Quality – Are the lines confident, controlled, and varied to define form, contour, or texture effectively?"""
+
+
+@functools.lru_cache(maxsize=None)
+def build_system_prompt_blocks(sketch_type):
+    """Return the system prompt as (static preamble, mode-specific suffix).
+
+    Callers send the two strings as separate input_text content blocks, in
+    order, so the invariant preamble forms a shared prefix that OpenAI's
+    automatic prompt caching can reuse across sketch types; only the trailing
+    criteria block varies.
+    """
+    suffix = ""
+
+    # Add additional criteria for full realism mode
+    if sketch_type == "full realism":
+        suffix += """
+Value & Light – Is there effective use of shading and light to create realistic depth, contrast, and form?
+Detail & Texture – Are the textures believable and appropriate for the subject? Is the level of detail well-judged?
+Composition & Perspective – Is the placement of elements balanced? Is perspective applied accurately?"""
+
+    # Add form and volume, mood and expression for both modes
+    suffix += """
+Form & Volume – Does the drawing feel three-dimensional? Are forms convincingly modeled through shading or structure?
+Mood & Expression – Does the image evoke a mood, emotion, or atmosphere, even subtly?"""
+
+    # Add overall realism for full realism mode only
+    if sketch_type == "full realism":
+        suffix += """
+Overall Realism – How realistic is the overall sketch in terms of visual believability and execution?"""
+
+    return (_PROMPT_PREAMBLE, suffix)
+
+
+@functools.lru_cache(maxsize=None)
+def build_system_prompt(sketch_type):
+    """Build the evaluation system prompt for a sketch type as one string (memoized)."""
+    return "".join(build_system_prompt_blocks(sketch_type))
+
+
+_CRITERION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {
+            "type": "integer",
+            "description": "Score between 1 and 20, where 1 is poor and 20 is excellent"
+        },
+        "rationale": {
+            "type": "string",
+            "description": "1-3 sentence explanation for the score"
+        },
+        "improvement_tips": {
+            "type": "array",
+            "items": {
+                "type": "string"
+            },
+            "description": "1-3 actionable tips for improvement"
+        }
+    },
+    "required": ["score", "rationale", "improvement_tips"],
+    "additionalProperties": False
+}
+
+# Criterion keys per mode, in the order they appear in the prompt
+CRITERIA_QUICK = (
+    "proportion_and_structure",
+    "line_quality",
+    "form_and_volume",
+    "mood_and_expression",
+)
+CRITERIA_FULL = (
+    "proportion_and_structure",
+    "line_quality",
+    "value_and_light",
+    "detail_and_texture",
+    "composition_and_perspective",
+    "form_and_volume",
+    "mood_and_expression",
+    "overall_realism",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def build_schema(sketch_type):
+    """Build the JSON schema for structured evaluation output for a sketch type (memoized).
+
+    Every criterion shares the same score/rationale/tips shape, so it is
+    defined once under $defs and each property just $ref's it — structured
+    outputs resolve the reference server-side, and the serialized request
+    carries one copy of the block instead of up to eight.
+    """
+    criteria = CRITERIA_FULL if sketch_type == "full realism" else CRITERIA_QUICK
+
+    properties = {
+        "generated_title": {
+            "type": "string",
+            "description": "A creative title for the artwork"
+        }
+    }
+    for key in criteria:
+        properties[key] = {"$ref": "#/$defs/criterion"}
+
+    return {
+        "type": "object",
+        "$defs": {"criterion": copy.deepcopy(_CRITERION_SCHEMA)},
+        "properties": properties,
+        "required": ["generated_title", *criteria],
+        "additionalProperties": False,
+    }
+
+
+def validate_evaluation(evaluation_data, sketch_type):
+    """Check a parsed evaluation for every expected criterion block.
+
+    Returns a list of missing key paths (empty when the payload is complete).
+    The strict json_schema output format makes deviations rare, so a direct
+    key walk over the criterion tuples is all the validation needed — it costs
+    microseconds and avoids pulling in a validator dependency.
+    """
+    criteria = CRITERIA_FULL if sketch_type == "full realism" else CRITERIA_QUICK
+    missing = []
+    if "generated_title" not in evaluation_data:
+        missing.append("generated_title")
+    for key in criteria:
+        block = evaluation_data.get(key)
+        if not isinstance(block, dict):
+            missing.append(key)
+            continue
+        for field in ("score", "rationale", "improvement_tips"):
+            if field not in block:
+                missing.append(f"{key}.{field}")
+    return missing
+
+
+# Warm both variants at import so the first click/request pays nothing
+for _sketch_type in ("quick sketch", "full realism"):
+    build_system_prompt_blocks(_sketch_type)
+    build_system_prompt(_sketch_type)
+    build_schema(_sketch_type)
+del _sketch_type
@@ -54,7 +54,9 @@ def upload_image(image_file, folder="artwork"):
             "created_at": datetime.now().isoformat()
         }
     except Exception as e:
-        st.error(f"Error uploading image: {str(e)}")
+        # May run on a worker thread (no ScriptRunContext), so log instead
+        # of calling st.error; the caller reports failures to the UI.
+        print(f"Error uploading image: {str(e)}")
         return None
 
 def delete_image(public_id):